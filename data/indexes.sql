@@ -0,0 +1,41 @@
+-- Multi-Agent Research System secondary indexes
+-- Applied by init_db.py after schema.sql, one statement at a time outside a transaction,
+-- so every index builds CONCURRENTLY without blocking writes to existing tables.
+-- Every statement must stay idempotent.
+
+-- Indexes for performance
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_research_sessions_user_id ON research_sessions(user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_research_sessions_status ON research_sessions(status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_research_sessions_created_at ON research_sessions(created_at);
+
+-- (session_id, created_at) serves the per-session listing in order without a sort,
+-- and replaces the single-column session_id index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subagent_executions_session_created ON subagent_executions(session_id, created_at);
+DROP INDEX CONCURRENTLY IF EXISTS idx_subagent_executions_session_id;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subagent_executions_agent_type ON subagent_executions(agent_type);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subagent_executions_status ON subagent_executions(status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subagent_executions_created_at ON subagent_executions(created_at);
+
+-- Per-session memory reads return newest first, with or without a memory_type filter.
+-- The expiry check can't be a partial index predicate (NOW() is not immutable), so it stays a filter.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_session_memory_session_created ON session_memory(session_id, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_session_memory_session_type_created ON session_memory(session_id, memory_type, created_at DESC);
+-- Superseded by the composite indexes above
+DROP INDEX CONCURRENTLY IF EXISTS idx_session_memory_session_id;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_session_memory_type ON session_memory(memory_type);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_session_memory_expires_at ON session_memory(expires_at);
+
+-- GIN indexes for JSONB fields (jsonb_path_ops: smaller and faster for @> containment filters)
+-- The _path_gin names replace the default-opclass *_gin indexes, which are dropped once their replacements exist
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_research_sessions_plan_path_gin ON research_sessions USING GIN (research_plan jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_research_sessions_outcome_path_gin ON research_sessions USING GIN (final_outcome jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subagent_executions_results_path_gin ON subagent_executions USING GIN (results jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_session_memory_content_path_gin ON session_memory USING GIN (content jsonb_path_ops);
+DROP INDEX CONCURRENTLY IF EXISTS idx_research_sessions_plan_gin;
+DROP INDEX CONCURRENTLY IF EXISTS idx_research_sessions_outcome_gin;
+DROP INDEX CONCURRENTLY IF EXISTS idx_subagent_executions_results_gin;
+DROP INDEX CONCURRENTLY IF EXISTS idx_session_memory_content_gin;
+
+-- Full-text search indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_research_sessions_query_fulltext ON research_sessions USING GIN (to_tsvector('english', initial_query));
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subagent_executions_task_fulltext ON subagent_executions USING GIN (to_tsvector('english', task_description));
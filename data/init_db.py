@@ -5,9 +5,11 @@ Database initialization script for Multi-Agent Research System
 
 import os
 import asyncio
+import re
+import hashlib
 import asyncpg
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 # Load environment variables
 try:
@@ -25,6 +27,64 @@ DB_CONFIG = {
     'password': os.getenv('POSTGRES_PASSWORD', 'postgres')
 }
 
+# Schema file, read once at import before any event loop is running
+SCHEMA_PATH = Path(__file__).parent / 'schema.sql'
+SCHEMA_SQL: Optional[bytes] = SCHEMA_PATH.read_bytes() if SCHEMA_PATH.exists() else None
+
+# Secondary indexes, built CONCURRENTLY so they can't run inside the schema transaction
+INDEXES_PATH = Path(__file__).parent / 'indexes.sql'
+INDEXES_SQL: bytes = INDEXES_PATH.read_bytes() if INDEXES_PATH.exists() else b''
+
+def split_sql_statements(sql: str) -> List[str]:
+    """Split a script of plain statements (no function bodies) on semicolons, dropping comments"""
+    lines = [line for line in sql.splitlines() if not line.lstrip().startswith('--')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+INDEX_STATEMENTS = split_sql_statements(INDEXES_SQL.decode('utf-8'))
+INDEX_NAMES = [
+    match.group(1) for statement in INDEX_STATEMENTS
+    if (match := re.search(r'CREATE INDEX CONCURRENTLY IF NOT EXISTS (\w+)', statement))
+]
+
+# Seed users as (email, name) rows
+SEED_USERS = [
+    ('test@example.com', 'Test User'),
+]
+
+# Fingerprint of the schema and seed rows; an unchanged fingerprint means nothing to apply
+SCHEMA_VERSION: Optional[str] = (
+    hashlib.sha256(SCHEMA_SQL + INDEXES_SQL + repr(SEED_USERS).encode()).hexdigest() if SCHEMA_SQL is not None else None
+)
+
+# Health checks give up after this many seconds; migrations run unbounded
+CHECK_TIMEOUT_SECONDS = 30
+
+# Connection pool for the target database, created once it exists
+pool: Optional[asyncpg.Pool] = None
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the target database pool, creating it on first use"""
+    global pool
+    if pool is None:
+        # No command_timeout: asyncpg applies it even to timeout=None calls, and
+        # index builds and column rewrites on large tables can take far longer
+        pool = await asyncpg.create_pool(**DB_CONFIG, min_size=1, max_size=4)
+    return pool
+
+async def apply_indexes(conn: asyncpg.Connection):
+    """Build the secondary indexes one statement at a time, outside any transaction"""
+    # An interrupted CONCURRENTLY build leaves an invalid index that IF NOT EXISTS would skip forever
+    invalid = await conn.fetch("""
+        SELECT indexrelid::regclass::text AS name FROM pg_index
+        WHERE NOT indisvalid AND indexrelid::regclass::text = ANY($1::text[])
+    """, INDEX_NAMES)
+    for row in invalid:
+        print(f"Dropping invalid index {row['name']}...")
+        await conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {row["name"]}')
+    
+    for statement in INDEX_STATEMENTS:
+        await conn.execute(statement)
+
 async def init_database():
     """Initialize the database with schema and basic data"""
     
@@ -32,6 +92,7 @@ async def init_database():
     default_config = DB_CONFIG.copy()
     default_config['database'] = 'postgres'
     
+    # One-off bootstrap connection, only needed for CREATE DATABASE
     try:
         conn = await asyncpg.connect(**default_config)
         
@@ -43,7 +104,9 @@ async def init_database():
         
         if not db_exists:
             print(f"Creating database {DB_CONFIG['database']}...")
-            await conn.execute(f'CREATE DATABASE "{DB_CONFIG["database"]}"')
+            # Identifiers can't be bound as parameters, so double any embedded quotes
+            db_name = DB_CONFIG['database'].replace('"', '""')
+            await conn.execute(f'CREATE DATABASE "{db_name}"')
             print(f"Database {DB_CONFIG['database']} created successfully")
         else:
             print(f"Database {DB_CONFIG['database']} already exists")
@@ -56,32 +119,52 @@ async def init_database():
     
     # Now connect to our target database and run schema
     try:
-        conn = await asyncpg.connect(**DB_CONFIG)
+        db_pool = await get_pool()
         
-        # Read and execute schema
-        schema_path = Path(__file__).parent / 'schema.sql'
-        if schema_path.exists():
-            print("Executing schema.sql...")
-            with open(schema_path, 'r') as f:
-                schema_sql = f.read()
+        async with db_pool.acquire() as conn:
+            if SCHEMA_SQL is None:
+                print(f"Warning: schema.sql not found at {SCHEMA_PATH}")
+                return False
             
-            await conn.execute(schema_sql)
-            print("Schema executed successfully")
-        else:
-            print(f"Warning: schema.sql not found at {schema_path}")
-        
-        # Insert basic test data
-        print("Inserting test data...")
-        test_user_id = await conn.fetchval("""
-            INSERT INTO users (email, name) 
-            VALUES ('test@example.com', 'Test User')
-            ON CONFLICT (email) DO UPDATE SET name = EXCLUDED.name
-            RETURNING user_id
-        """)
-        
-        print(f"Test user created/updated with ID: {test_user_id}")
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                    version VARCHAR(64) NOT NULL,
+                    applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+            applied_version = await conn.fetchval("SELECT version FROM schema_version WHERE id = 1")
+            if applied_version == SCHEMA_VERSION:
+                print("Schema and seed data already up to date")
+                return True
+            
+            # Schema and seed data go in one transaction so a failure leaves nothing half-applied
+            async with conn.transaction():
+                print("Executing schema.sql...")
+                await conn.execute(SCHEMA_SQL.decode('utf-8'))
+                print("Schema executed successfully")
+                
+                # Upsert all seed users in a single statement
+                print("Inserting test data...")
+                emails, names = zip(*SEED_USERS)
+                seeded = await conn.fetch("""
+                    INSERT INTO users (email, name)
+                    SELECT * FROM unnest($1::text[], $2::text[])
+                    ON CONFLICT (email) DO UPDATE SET name = EXCLUDED.name
+                    RETURNING user_id
+                """, list(emails), list(names))
+            
+            print("Building indexes...")
+            await apply_indexes(conn)
+            print("Indexes built successfully")
+            
+            # Recorded last so a failed index build is retried on the next run
+            await conn.execute("""
+                INSERT INTO schema_version (id, version) VALUES (1, $1)
+                ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version, applied_at = NOW()
+            """, SCHEMA_VERSION)
         
-        await conn.close()
+        print(f"Seeded {len(seeded)} user(s)")
         print("Database initialization completed successfully")
         return True
         
@@ -92,29 +175,39 @@ async def init_database():
 async def check_connection() -> bool:
     """Check if database connection is working"""
     try:
-        conn = await asyncpg.connect(**DB_CONFIG)
-        result = await conn.fetchval("SELECT 1")
-        await conn.close()
+        db_pool = await get_pool()
+        async with db_pool.acquire() as conn:
+            result = await conn.fetchval("SELECT 1", timeout=CHECK_TIMEOUT_SECONDS)
         return result == 1
     except Exception as e:
         print(f"Database connection failed: {e}")
         return False
 
+async def main() -> bool:
+    """Initialize the database and test the connection on one event loop"""
+    try:
+        success = await init_database()
+        
+        if success:
+            print("\n✓ Database initialization completed successfully")
+            
+            # Test connection
+            if await check_connection():
+                print("✓ Database connection test passed")
+            else:
+                print("✗ Database connection test failed")
+        else:
+            print("\n✗ Database initialization failed")
+        
+        return success
+    finally:
+        if pool is not None:
+            await pool.close()
+
 if __name__ == "__main__":
     print("Multi-Agent Research System - Database Initialization")
     print("=" * 50)
     print(f"Connecting to: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
     
-    success = asyncio.run(init_database())
-    
-    if success:
-        print("\n✓ Database initialization completed successfully")
-        
-        # Test connection
-        if asyncio.run(check_connection()):
-            print("✓ Database connection test passed")
-        else:
-            print("✗ Database connection test failed")
-    else:
-        print("\n✗ Database initialization failed")
-        exit(1) 
\ No newline at end of file
+    if not asyncio.run(main()):
+        exit(1)
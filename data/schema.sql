@@ -5,8 +5,27 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pg_trgm"; -- For text similarity searches
 
+-- Enum types; the agent database client maps these to its Python enums.
+-- CREATE TYPE has no IF NOT EXISTS, so each one is guarded to keep this script re-runnable.
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'session_status') THEN
+        CREATE TYPE session_status AS ENUM ('active', 'completed', 'failed', 'cancelled');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'agent_type') THEN
+        CREATE TYPE agent_type AS ENUM ('metadata', 'entitlement', 'data', 'aggregation');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'execution_status') THEN
+        CREATE TYPE execution_status AS ENUM ('running', 'completed', 'failed');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'memory_type') THEN
+        CREATE TYPE memory_type AS ENUM ('research_plan', 'intermediate_results', 'context_summary', 'artifact_reference');
+    END IF;
+END;
+$$;
+
 -- Basic user management for MVP
-CREATE TABLE users (
+CREATE TABLE IF NOT EXISTS users (
     user_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     email VARCHAR(255) UNIQUE,
     name VARCHAR(255),
@@ -15,7 +34,7 @@ CREATE TABLE users (
 );
 
 -- Research sessions for multi-agent orchestration
-CREATE TABLE research_sessions (
+CREATE TABLE IF NOT EXISTS research_sessions (
     session_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID REFERENCES users(user_id),
     initial_query TEXT NOT NULL,
@@ -23,20 +42,22 @@ CREATE TABLE research_sessions (
     final_outcome JSONB,
     token_usage INTEGER DEFAULT 0,
     session_duration INTERVAL,
-    status VARCHAR(50) DEFAULT 'active' CHECK (status IN ('active', 'completed', 'failed', 'cancelled')),
+    status session_status DEFAULT 'active',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    completed_at TIMESTAMP WITH TIME ZONE
+    completed_at TIMESTAMP WITH TIME ZONE,
+    -- Precomputed for analytics; NULL until the session completes
+    duration_seconds DOUBLE PRECISION GENERATED ALWAYS AS (EXTRACT(EPOCH FROM (completed_at - created_at))) STORED
 );
 
 -- Subagent execution tracking
-CREATE TABLE subagent_executions (
+CREATE TABLE IF NOT EXISTS subagent_executions (
     execution_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     session_id UUID REFERENCES research_sessions(session_id),
-    agent_type VARCHAR(50) NOT NULL CHECK (agent_type IN ('metadata', 'entitlement', 'data', 'aggregation')),
+    agent_type agent_type NOT NULL,
     task_description TEXT,
-    tool_calls JSONB,
+    tool_calls JSONB, -- Large LLM/tool payloads; TOASTed with lz4 where available (see below)
     results JSONB,
-    status VARCHAR(50) DEFAULT 'running' CHECK (status IN ('running', 'completed', 'failed')),
+    status execution_status DEFAULT 'running',
     execution_time_ms INTEGER,
     error_message TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -44,10 +65,10 @@ CREATE TABLE subagent_executions (
 );
 
 -- Session memory for context management
-CREATE TABLE session_memory (
+CREATE TABLE IF NOT EXISTS session_memory (
     memory_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     session_id UUID REFERENCES research_sessions(session_id),
-    memory_type VARCHAR(50) NOT NULL CHECK (memory_type IN ('research_plan', 'intermediate_results', 'context_summary', 'artifact_reference')),
+    memory_type memory_type NOT NULL,
     content JSONB,
     artifact_path TEXT, -- For large files stored on filesystem
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -55,7 +76,7 @@ CREATE TABLE session_memory (
 );
 
 -- Agent performance metrics
-CREATE TABLE agent_metrics (
+CREATE TABLE IF NOT EXISTS agent_metrics (
     metric_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     session_id UUID REFERENCES research_sessions(session_id),
     agent_type VARCHAR(50),
@@ -65,26 +86,103 @@ CREATE TABLE agent_metrics (
     recorded_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
--- Indexes for performance
-CREATE INDEX idx_research_sessions_user_id ON research_sessions(user_id);
-CREATE INDEX idx_research_sessions_status ON research_sessions(status);
-CREATE INDEX idx_research_sessions_created_at ON research_sessions(created_at);
+-- Migrate databases created before the enum types: the VARCHAR + CHECK columns are
+-- converted in place. Defaults are dropped around the change since a text default
+-- can't be cast automatically.
+DO $$
+DECLARE
+    col RECORD;
+BEGIN
+    FOR col IN
+        SELECT * FROM (VALUES
+            ('research_sessions', 'status', 'session_status', 'active'),
+            ('subagent_executions', 'agent_type', 'agent_type', NULL),
+            ('subagent_executions', 'status', 'execution_status', 'running'),
+            ('session_memory', 'memory_type', 'memory_type', NULL)
+        ) AS c(table_name, column_name, type_name, default_value)
+    LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND table_name = col.table_name
+              AND column_name = col.column_name
+              AND data_type = 'character varying'
+        ) THEN
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT IF EXISTS %I', col.table_name, col.table_name || '_' || col.column_name || '_check');
+            EXECUTE format('ALTER TABLE %I ALTER COLUMN %I DROP DEFAULT', col.table_name, col.column_name);
+            EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE %I USING %I::%I',
+                           col.table_name, col.column_name, col.type_name, col.column_name, col.type_name);
+            IF col.default_value IS NOT NULL THEN
+                EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT %L', col.table_name, col.column_name, col.default_value);
+            END IF;
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- Add the generated duration column to research_sessions tables created before it existed
+ALTER TABLE research_sessions
+    ADD COLUMN IF NOT EXISTS duration_seconds DOUBLE PRECISION
+    GENERATED ALWAYS AS (EXTRACT(EPOCH FROM (completed_at - created_at))) STORED;
+
+-- TOAST the large execution payloads with lz4 when the server was built with it.
+-- Only values written after the change are recompressed.
+DO $$
+DECLARE
+    col TEXT;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_settings
+        WHERE name = 'default_toast_compression' AND 'lz4' = ANY(enumvals)
+    ) THEN
+        FOREACH col IN ARRAY ARRAY['tool_calls', 'results'] LOOP
+            IF EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = 'subagent_executions'::regclass
+                  AND attname = col
+                  AND attcompression IS DISTINCT FROM 'l'
+            ) THEN
+                EXECUTE format('ALTER TABLE subagent_executions ALTER COLUMN %I SET COMPRESSION lz4', col);
+            END IF;
+        END LOOP;
+    END IF;
+END;
+$$;
 
-CREATE INDEX idx_subagent_executions_session_id ON subagent_executions(session_id);
-CREATE INDEX idx_subagent_executions_agent_type ON subagent_executions(agent_type);
-CREATE INDEX idx_subagent_executions_status ON subagent_executions(status);
-CREATE INDEX idx_subagent_executions_created_at ON subagent_executions(created_at);
+-- Secondary indexes live in indexes.sql, which init_db.py applies outside a
+-- transaction so they can be built CONCURRENTLY on live tables
 
-CREATE INDEX idx_session_memory_session_id ON session_memory(session_id);
-CREATE INDEX idx_session_memory_type ON session_memory(memory_type);
-CREATE INDEX idx_session_memory_expires_at ON session_memory(expires_at);
+-- Notify listeners when a research session changes so their session caches drop it
+CREATE OR REPLACE FUNCTION notify_session_updated() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('session_updated', NEW.session_id::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
 
--- GIN indexes for JSONB fields
-CREATE INDEX idx_research_sessions_plan_gin ON research_sessions USING GIN (research_plan);
-CREATE INDEX idx_research_sessions_outcome_gin ON research_sessions USING GIN (final_outcome);
-CREATE INDEX idx_subagent_executions_results_gin ON subagent_executions USING GIN (results);
-CREATE INDEX idx_session_memory_content_gin ON session_memory USING GIN (content);
+-- OR REPLACE (PostgreSQL 14+) keeps re-runs idempotent
+CREATE OR REPLACE TRIGGER research_sessions_notify_updated
+    AFTER UPDATE ON research_sessions
+    FOR EACH ROW EXECUTE FUNCTION notify_session_updated();
 
--- Full-text search indexes
-CREATE INDEX idx_research_sessions_query_fulltext ON research_sessions USING GIN (to_tsvector('english', initial_query));
-CREATE INDEX idx_subagent_executions_task_fulltext ON subagent_executions USING GIN (to_tsvector('english', task_description)); 
\ No newline at end of file
+-- Embedding search: the plan cache for reusing research plans across similar queries,
+-- and session memory embeddings for top-K retrieval. Needs the pgvector extension,
+-- so it is only set up where pgvector is available.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'vector') THEN
+        CREATE EXTENSION IF NOT EXISTS vector;
+        CREATE TABLE IF NOT EXISTS plan_cache (
+            plan_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            goal_embedding vector(1536) NOT NULL,
+            research_mode TEXT NOT NULL,
+            plan JSONB NOT NULL,
+            hits INTEGER DEFAULT 0,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        );
+        CREATE INDEX IF NOT EXISTS idx_plan_cache_embedding ON plan_cache USING hnsw (goal_embedding vector_cosine_ops);
+        ALTER TABLE session_memory ADD COLUMN IF NOT EXISTS embedding vector(1536);
+        CREATE INDEX IF NOT EXISTS idx_session_memory_embedding ON session_memory USING hnsw (embedding vector_cosine_ops);
+    END IF;
+END;
+$$;
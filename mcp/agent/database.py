@@ -5,18 +5,111 @@ Handles PostgreSQL connections and operations for agent coordination
 """
 
 import os
+import time
 import asyncio
 import asyncpg
 import json
 import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Union, Tuple, AsyncIterator
+from functools import lru_cache
+from dataclasses import dataclass, replace
 from enum import Enum
+from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Connection pinned by DatabaseClient.session(), paired with the task that owns it
+_current_conn: ContextVar[Optional[tuple]] = ContextVar('_current_conn', default=None)
+
+# Rows fetched per round trip when streaming executions through a cursor
+EXECUTION_CURSOR_PREFETCH = 200
+
+# Batches larger than this are loaded with COPY instead of executemany
+BULK_COPY_THRESHOLD = 8
+
+# get_research_session results are cached briefly; a trigger on research_sessions
+# NOTIFYs this channel on every update so all clients drop stale entries
+SESSION_CACHE_TTL_SECONDS = 5.0
+SESSION_CACHE_MAX_ENTRIES = 10_000
+SESSION_UPDATED_CHANNEL = 'session_updated'
+# Longest wait between attempts to re-establish a lost session listener
+LISTENER_RECONNECT_MAX_DELAY_SECONDS = 30.0
+
+# warm_up gives up on a connection it can't acquire within this many seconds
+WARM_UP_ACQUIRE_TIMEOUT_SECONDS = 5.0
+
+# JSONB binary wire format is a version byte followed by the JSON text
+JSONB_FORMAT_VERSION = b'\x01'
+
+# Prefer orjson for JSON encoding when it is installed
+try:
+    import orjson
+    
+    def _dump_json(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    
+    _load_json = orjson.loads
+except ImportError:
+    def _dump_json(value: Any) -> bytes:
+        return json.dumps(value).encode('utf-8')
+    
+    _load_json = json.loads
+
+def _encode_jsonb(value: Any) -> bytes:
+    # bytes are JSON that was already encoded (see DatabaseClient._externalize)
+    if isinstance(value, bytes):
+        return JSONB_FORMAT_VERSION + value
+    return JSONB_FORMAT_VERSION + _dump_json(value)
+
+def _decode_jsonb(data: bytes) -> Any:
+    return _load_json(data[1:])
+
+# When AGENT_ARTIFACT_DIR is set, JSONB payloads larger than this are written there
+# and stored inline as {"@ref": path}. The read methods resolve references, so the
+# directory must be an absolute path every server process and replica can read.
+MAX_INLINE_JSONB_BYTES = 64 * 1024
+ARTIFACT_DIR: Optional[Path] = Path(os.environ['AGENT_ARTIFACT_DIR']) if os.getenv('AGENT_ARTIFACT_DIR') else None
+PAYLOAD_REF_KEY = '@ref'
+
+if ARTIFACT_DIR is not None and not ARTIFACT_DIR.is_absolute():
+    raise ValueError("AGENT_ARTIFACT_DIR must be an absolute path on storage shared by all server processes")
+
+# JSONB fields of each record type that may hold an @ref
+RESEARCH_SESSION_PAYLOAD_FIELDS = ('research_plan', 'final_outcome')
+SUBAGENT_EXECUTION_PAYLOAD_FIELDS = ('tool_calls', 'results')
+SESSION_MEMORY_PAYLOAD_FIELDS = ('content',)
+
+def _is_payload_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and PAYLOAD_REF_KEY in value
+
+def _write_artifact(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+def _vector_literal(embedding: List[float]) -> str:
+    """Format an embedding as pgvector text input, e.g. '[0.1,0.2]'"""
+    return '[' + ','.join(map(str, embedding)) + ']'
+
+@lru_cache(maxsize=None)
+def _build_update_sql(
+    table: str,
+    key_column: str,
+    columns: Tuple[str, ...],
+    now_columns: Tuple[str, ...] = ()
+) -> str:
+    """Build an UPDATE for one combination of set columns, once per combination
+    
+    ``columns`` are bound to $1..$n in order; ``now_columns`` are set to the
+    server's NOW() and take no parameter.
+    """
+    assignments = [f"{column} = ${idx}" for idx, column in enumerate(columns, start=1)]
+    assignments += [f"{column} = NOW()" for column in now_columns]
+    return f"UPDATE {table} SET {', '.join(assignments)} WHERE {key_column} = ${len(columns) + 1}"
+
 class SessionStatus(Enum):
     ACTIVE = "active"
     COMPLETED = "completed"
@@ -40,7 +133,15 @@ class MemoryType(Enum):
     CONTEXT_SUMMARY = "context_summary"
     ARTIFACT_REFERENCE = "artifact_reference"
 
-@dataclass
+# PostgreSQL enum types and the Python enums they decode to
+PG_ENUM_TYPES = {
+    'session_status': SessionStatus,
+    'agent_type': AgentType,
+    'execution_status': ExecutionStatus,
+    'memory_type': MemoryType,
+}
+
+@dataclass(slots=True)
 class ResearchSession:
     session_id: str
     user_id: str
@@ -53,7 +154,7 @@ class ResearchSession:
     created_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class SubagentExecution:
     execution_id: str
     session_id: str
@@ -67,7 +168,7 @@ class SubagentExecution:
     created_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class SessionMemory:
     memory_id: str
     session_id: str
@@ -77,21 +178,239 @@ class SessionMemory:
     created_at: Optional[datetime] = None
     expires_at: Optional[datetime] = None
 
+# SQL statements, kept as fixed module-level text so asyncpg's per-connection
+# prepared statement cache hits on every call after the first
+GET_RESEARCH_SESSION_SQL = """
+    SELECT session_id, user_id, initial_query, research_plan, final_outcome,
+           token_usage, session_duration, status, created_at, completed_at
+    FROM research_sessions 
+    WHERE session_id = $1
+"""
+
+GET_SESSION_EXECUTIONS_SQL = """
+    SELECT execution_id, session_id, agent_type, task_description, tool_calls, 
+           results, status, execution_time_ms, error_message, created_at, completed_at
+    FROM subagent_executions 
+    WHERE session_id = $1
+    ORDER BY created_at
+"""
+
+# Status view of a session's executions, built server side as one JSONB array
+GET_SESSION_EXECUTIONS_JSON_SQL = """
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+        'execution_id', execution_id,
+        'agent_type', agent_type,
+        'status', status,
+        'task_description', task_description,
+        'execution_time_ms', execution_time_ms,
+        'error_message', error_message
+    ) ORDER BY created_at), '[]'::jsonb)
+    FROM subagent_executions 
+    WHERE session_id = $1
+"""
+
+GET_SESSION_MEMORY_SQL = """
+    SELECT memory_id, session_id, memory_type, content, artifact_path, created_at, expires_at
+    FROM session_memory 
+    WHERE session_id = $1
+    AND (expires_at IS NULL OR expires_at > NOW())
+    ORDER BY created_at DESC
+"""
+
+GET_SESSION_MEMORY_BY_TYPE_SQL = """
+    SELECT memory_id, session_id, memory_type, content, artifact_path, created_at, expires_at
+    FROM session_memory 
+    WHERE session_id = $1 AND memory_type = $2
+    AND (expires_at IS NULL OR expires_at > NOW())
+    ORDER BY created_at DESC
+"""
+
+# Live memory count plus a version tag that changes whenever the set of live memories
+# does; memories are never edited in place, so their IDs identify the content
+GET_SESSION_MEMORY_SUMMARY_SQL = """
+    SELECT COUNT(*), md5(COALESCE(string_agg(memory_id::text, ',' ORDER BY memory_id), ''))
+    FROM session_memory 
+    WHERE session_id = $1
+    AND (expires_at IS NULL OR expires_at > NOW())
+"""
+
+# Top-K memories nearest to a query embedding; only rows stored with an embedding qualify
+GET_TOP_K_SESSION_MEMORY_SQL = """
+    SELECT memory_id, session_id, memory_type, content, artifact_path, created_at, expires_at
+    FROM session_memory 
+    WHERE session_id = $1 AND embedding IS NOT NULL
+    AND (expires_at IS NULL OR expires_at > NOW())
+    ORDER BY embedding <=> $2::text::vector
+    LIMIT $3
+"""
+
+UPSERT_USER_SQL = """
+    INSERT INTO users (email, name) 
+    VALUES ($1, $2)
+    ON CONFLICT (email) DO UPDATE SET 
+        name = COALESCE(EXCLUDED.name, users.name),
+        updated_at = NOW()
+    RETURNING user_id
+"""
+
+INSERT_RESEARCH_SESSION_SQL = """
+    INSERT INTO research_sessions (user_id, initial_query, research_plan)
+    VALUES ($1, $2, $3)
+    RETURNING session_id, user_id, initial_query, research_plan, final_outcome,
+              token_usage, session_duration, status, created_at, completed_at
+"""
+
+INSERT_SUBAGENT_EXECUTION_SQL = """
+    INSERT INTO subagent_executions (session_id, agent_type, task_description, tool_calls)
+    VALUES ($1, $2, $3, $4)
+    RETURNING execution_id
+"""
+
+BULK_UPDATE_SUBAGENT_EXECUTIONS_SQL = """
+    UPDATE subagent_executions 
+    SET status = COALESCE($2, status),
+        completed_at = CASE WHEN $3 THEN NOW() ELSE completed_at END,
+        results = COALESCE($4, results),
+        execution_time_ms = COALESCE($5, execution_time_ms),
+        error_message = COALESCE($6, error_message)
+    WHERE execution_id = $1
+"""
+
+INSERT_SESSION_MEMORY_SQL = """
+    INSERT INTO session_memory (session_id, memory_type, content, artifact_path, expires_at)
+    VALUES ($1, $2, $3, $4, $5)
+    RETURNING memory_id
+"""
+
+# Nearest cached plan for a research mode, counted as a hit only when it is
+# similar enough. Embeddings are bound as pgvector text literals.
+PLAN_CACHE_LOOKUP_SQL = """
+    WITH nearest AS (
+        SELECT plan_id, plan, 1 - (goal_embedding <=> $2::text::vector) AS similarity
+        FROM plan_cache
+        WHERE research_mode = $1
+        ORDER BY goal_embedding <=> $2::text::vector
+        LIMIT 1
+    )
+    UPDATE plan_cache p SET hits = p.hits + 1
+    FROM nearest n
+    WHERE p.plan_id = n.plan_id AND n.similarity >= $3
+    RETURNING n.plan
+"""
+
+PLAN_CACHE_STORE_SQL = """
+    INSERT INTO plan_cache (goal_embedding, research_mode, plan)
+    VALUES ($1::text::vector, $2, $3)
+"""
+
+INSERT_SESSION_MEMORY_WITH_EMBEDDING_SQL = """
+    INSERT INTO session_memory (session_id, memory_type, content, artifact_path, expires_at, embedding)
+    VALUES ($1, $2, $3, $4, $5, $6::text::vector)
+    RETURNING memory_id
+"""
+
+SESSION_ANALYTICS_SQL = """
+    WITH session_stats AS (
+        SELECT 
+            COUNT(*) as total_sessions,
+            COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_sessions,
+            COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed_sessions,
+            AVG(token_usage) as avg_token_usage,
+            AVG(duration_seconds) as avg_duration_seconds
+        FROM research_sessions 
+        WHERE created_at > NOW() - $1::int * INTERVAL '1 day'
+    ),
+    subagent_stats AS (
+        SELECT 
+            agent_type,
+            COUNT(*) as total_executions,
+            COUNT(CASE WHEN status = 'completed' THEN 1 END) as successful_executions,
+            AVG(execution_time_ms) as avg_execution_time_ms
+        FROM subagent_executions 
+        WHERE created_at > NOW() - $1::int * INTERVAL '1 day'
+        GROUP BY agent_type
+    )
+    SELECT jsonb_build_object(
+        'session_stats', (SELECT to_jsonb(s) FROM session_stats s),
+        'subagent_stats', COALESCE((SELECT jsonb_agg(a) FROM subagent_stats a), '[]'::jsonb)
+    )
+"""
+
+# Row factories. The SELECTs above list columns in dataclass field order, so
+# rows are unpacked by position instead of looked up by column name. Enum
+# columns already arrive as Python enums via the codecs in _init_connection.
+def _research_session_from_row(row: asyncpg.Record) -> ResearchSession:
+    return ResearchSession(*row)
+
+def _subagent_execution_from_row(row: asyncpg.Record) -> SubagentExecution:
+    return SubagentExecution(*row)
+
+def _session_memory_from_row(row: asyncpg.Record) -> SessionMemory:
+    return SessionMemory(*row)
+
 class DatabaseClient:
     """PostgreSQL client for multi-agent system coordination"""
     
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        self._listener: Optional[asyncpg.Connection] = None
+        self._relisten_task: Optional[asyncio.Task] = None
+        self._session_cache: Dict[str, Tuple[float, ResearchSession]] = {}
         self.config = {
             'host': os.getenv('POSTGRES_HOST', 'localhost'),
             'port': int(os.getenv('POSTGRES_PORT', 5432)),
             'database': os.getenv('POSTGRES_DB', 'dataflow_agents'),
             'user': os.getenv('POSTGRES_USER', 'postgres'),
             'password': os.getenv('POSTGRES_PASSWORD', 'postgres'),
-            'min_size': 5,
-            'max_size': 20
+            'min_size': int(os.getenv('POSTGRES_POOL_MIN', 5)),
+            # Queries mostly wait on the network, so allow a couple of connections per core
+            'max_size': int(os.getenv('POSTGRES_POOL_MAX', (os.cpu_count() or 1) * 2 + 4)),
+            'command_timeout': 30,
+            'max_inactive_connection_lifetime': 300,
+            # Room for every distinct statement, including the update_* field combinations
+            'statement_cache_size': 1024,
+            'max_cached_statement_lifetime': 0,
+            'init': self._init_connection
         }
     
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection):
+        """Exchange JSONB and enum columns as Python objects on every pooled connection
+        
+        The codecs use the binary format so COPY (used by the bulk inserts)
+        goes through them as well as regular queries.
+        """
+        await conn.set_type_codec(
+            'jsonb',
+            encoder=_encode_jsonb,
+            decoder=_decode_jsonb,
+            schema='pg_catalog',
+            format='binary'
+        )
+        
+        # PG enums travel as their label in both formats, so binary codecs cover COPY too.
+        # A database that predates the enum types has none of them until init_db.py
+        # migrates it, so only the types that exist get a codec.
+        existing_types = {
+            row['typname'] for row in await conn.fetch(
+                "SELECT typname FROM pg_type WHERE typname = ANY($1::text[])", list(PG_ENUM_TYPES)
+            )
+        }
+        missing_types = PG_ENUM_TYPES.keys() - existing_types
+        if missing_types:
+            logger.warning(f"Enum types missing, run data/init_db.py to migrate: {sorted(missing_types)}")
+        
+        for type_name, enum_cls in PG_ENUM_TYPES.items():
+            if type_name not in existing_types:
+                continue
+            await conn.set_type_codec(
+                type_name,
+                encoder=lambda member: member.value.encode('utf-8'),
+                decoder=lambda data, enum_cls=enum_cls: enum_cls(data.decode('utf-8')),
+                schema='public',
+                format='binary'
+            )
+    
     async def connect(self):
         """Initialize database connection pool"""
         try:
@@ -100,40 +419,207 @@ class DatabaseClient:
         except Exception as e:
             logger.error(f"Failed to create database pool: {e}")
             raise
+        
+        # Without the listener the session cache still expires by TTL
+        try:
+            await self._start_listener()
+        except Exception as e:
+            logger.warning(f"Session update listener unavailable: {e}")
     
     async def disconnect(self):
         """Close database connection pool"""
+        if self._relisten_task:
+            self._relisten_task.cancel()
+            self._relisten_task = None
         if self.pool:
+            if self._listener:
+                self._listener.remove_termination_listener(self._on_listener_terminated)
+                await self._listener.remove_listener(SESSION_UPDATED_CHANNEL, self._on_session_updated)
+                await self.pool.release(self._listener)
+                self._listener = None
             await self.pool.close()
             logger.info("Database connection pool closed")
+        self._session_cache.clear()
+    
+    async def warm_up(self):
+        """Round-trip once on min_size pooled connections so first requests find them ready
+        
+        The count is capped so the session listener keeps its slot and one more
+        stays free, and each acquire times out, so warm-up can't wait forever on
+        a pool configured with POSTGRES_POOL_MIN >= POSTGRES_POOL_MAX.
+        """
+        reserved = 1 + (self._listener is not None)
+        count = min(self.pool.get_min_size(), self.pool.get_max_size() - reserved)
+        if count <= 0:
+            return
+        
+        results = await asyncio.gather(
+            *[self.pool.acquire(timeout=WARM_UP_ACQUIRE_TIMEOUT_SECONDS) for _ in range(count)],
+            return_exceptions=True
+        )
+        connections = [conn for conn in results if not isinstance(conn, BaseException)]
+        try:
+            await asyncio.gather(*[conn.execute("SELECT 1") for conn in connections])
+        finally:
+            for conn in connections:
+                await self.pool.release(conn)
+        
+        errors = [e for e in results if isinstance(e, BaseException)]
+        if errors:
+            logger.warning(f"Warmed {len(connections)} of {count} pooled connections: {errors[0]}")
+    
+    def _on_session_updated(self, conn, pid, channel, payload):
+        """Drop a session from the cache when any client updates it"""
+        self._session_cache.pop(payload, None)
+    
+    async def _start_listener(self):
+        """Hold one pooled connection that LISTENs for session updates"""
+        conn = await self.pool.acquire()
+        try:
+            await conn.add_listener(SESSION_UPDATED_CHANNEL, self._on_session_updated)
+            conn.add_termination_listener(self._on_listener_terminated)
+        except Exception:
+            await self.pool.release(conn)
+            raise
+        self._listener = conn
+    
+    def _on_listener_terminated(self, conn):
+        """Drop every cached session and start re-listening when the listener connection is lost"""
+        self._session_cache.clear()
+        if conn is not self._listener:
+            return
+        self._listener = None
+        logger.warning("Session update listener connection lost, reconnecting")
+        self._relisten_task = asyncio.get_running_loop().create_task(self._relisten(conn))
+    
+    async def _relisten(self, lost: asyncpg.Connection):
+        """Re-establish the session listener, backing off between failed attempts"""
+        try:
+            # Hands the slot back so the pool can replace the dead connection
+            await self.pool.release(lost)
+        except Exception as e:
+            logger.debug(f"Releasing lost listener connection failed: {e}")
+        
+        delay = 1.0
+        while not self.pool.is_closing():
+            try:
+                await self._start_listener()
+            except Exception as e:
+                logger.warning(f"Session update listener reconnect failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LISTENER_RECONNECT_MAX_DELAY_SECONDS)
+                continue
+            # Updates made while the listener was down were never delivered
+            self._session_cache.clear()
+            logger.info("Session update listener re-established")
+            break
+        self._relisten_task = None
+    
+    @asynccontextmanager
+    async def session(self):
+        """Pin one pooled connection for every query the current task issues
+        
+        Helpers called inside the block reuse the pinned connection instead of
+        acquiring their own. Tasks spawned inside the block (e.g. via
+        asyncio.gather) fall back to the pool, since an asyncpg connection
+        can't run two queries at once.
+        """
+        conn = self._pinned_connection()
+        if conn is not None:
+            yield conn
+            return
+        
+        async with self.pool.acquire() as conn:
+            token = _current_conn.set((asyncio.current_task(), conn))
+            try:
+                yield conn
+            finally:
+                _current_conn.reset(token)
+    
+    def _pinned_connection(self) -> Optional[asyncpg.Connection]:
+        """Return the connection pinned by session() for this task, if any"""
+        pinned = _current_conn.get()
+        if pinned and pinned[0] is asyncio.current_task():
+            return pinned[1]
+        return None
+    
+    @asynccontextmanager
+    async def _acquire(self):
+        """Yield the pinned session connection, or borrow one from the pool"""
+        conn = self._pinned_connection()
+        if conn is not None:
+            yield conn
+        else:
+            async with self.pool.acquire() as conn:
+                yield conn
+    
+    async def _externalize(self, value: Optional[Dict]) -> Any:
+        """Prepare a JSONB payload for writing, offloading it if it is too large
+        
+        Payloads are returned pre-encoded so the codec doesn't serialize them a
+        second time; large ones are written to ARTIFACT_DIR, when configured, and
+        replaced by a reference.
+        """
+        if not value:
+            return None
+        
+        encoded = _dump_json(value)
+        if ARTIFACT_DIR is None or len(encoded) <= MAX_INLINE_JSONB_BYTES:
+            return encoded
+        
+        path = ARTIFACT_DIR / f"{uuid.uuid4()}.json"
+        await asyncio.to_thread(_write_artifact, path, encoded)
+        return {PAYLOAD_REF_KEY: str(path)}
+    
+    async def load_payload(self, value: Any) -> Any:
+        """Resolve a JSONB value read from the database, following an @ref if present"""
+        if _is_payload_ref(value):
+            data = await asyncio.to_thread(Path(value[PAYLOAD_REF_KEY]).read_bytes)
+            return _load_json(data)
+        return value
+    
+    async def _resolve_payloads(self, records: List[Any], fields: Tuple[str, ...]) -> List[Any]:
+        """Replace @ref payload fields of the records, in place, with the artifact contents"""
+        pending = [
+            (record, field) for record in records for field in fields
+            if _is_payload_ref(getattr(record, field))
+        ]
+        if pending:
+            loaded = await asyncio.gather(*[self.load_payload(getattr(record, field)) for record, field in pending])
+            for (record, field), value in zip(pending, loaded):
+                setattr(record, field, value)
+        return records
     
     async def execute_query(self, query: str, *args) -> Any:
         """Execute a query and return result"""
-        async with self.pool.acquire() as conn:
+        async with self._acquire() as conn:
             return await conn.fetch(query, *args)
     
     async def execute_single(self, query: str, *args) -> Any:
         """Execute a query and return single result"""
-        async with self.pool.acquire() as conn:
+        async with self._acquire() as conn:
             return await conn.fetchrow(query, *args)
     
     async def execute_value(self, query: str, *args) -> Any:
         """Execute a query and return single value"""
-        async with self.pool.acquire() as conn:
+        async with self._acquire() as conn:
             return await conn.fetchval(query, *args)
     
+    async def _bulk_insert(self, table: str, columns: List[str], records: List[tuple]) -> None:
+        """Insert many rows in one transaction, using COPY for large batches"""
+        async with self._acquire() as conn:
+            async with conn.transaction():
+                if len(records) > BULK_COPY_THRESHOLD:
+                    await conn.copy_records_to_table(table, records=records, columns=columns)
+                else:
+                    placeholders = ', '.join(f"${i}" for i in range(1, len(columns) + 1))
+                    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+                    await conn.executemany(query, records)
+    
     # User Management
     async def get_or_create_user(self, email: str, name: str = None) -> str:
         """Get existing user or create new one"""
-        query = """
-            INSERT INTO users (email, name) 
-            VALUES ($1, $2)
-            ON CONFLICT (email) DO UPDATE SET 
-                name = COALESCE(EXCLUDED.name, users.name),
-                updated_at = NOW()
-            RETURNING user_id
-        """
-        return await self.execute_value(query, email, name)
+        return await self.execute_value(UPSERT_USER_SQL, email, name)
     
     # Research Sessions
     async def create_research_session(
@@ -141,15 +627,19 @@ class DatabaseClient:
         user_id: str, 
         initial_query: str,
         research_plan: Optional[Dict] = None
-    ) -> str:
-        """Create a new research session"""
-        query = """
-            INSERT INTO research_sessions (user_id, initial_query, research_plan)
-            VALUES ($1, $2, $3)
-            RETURNING session_id
-        """
-        plan_json = json.dumps(research_plan) if research_plan else None
-        return await self.execute_value(query, user_id, initial_query, plan_json)
+    ) -> ResearchSession:
+        """Create a new research session and return it as stored"""
+        row = await self.execute_single(
+            INSERT_RESEARCH_SESSION_SQL, user_id, initial_query, await self._externalize(research_plan)
+        )
+        session = _research_session_from_row(row)
+        # The row may hold an @ref; the caller's plan is the resolved value
+        session.research_plan = research_plan or None
+        
+        # Seed the read cache so the first get_research_session skips the SELECT.
+        # The cache keeps its own copy so callers can't mutate a cached session.
+        self._session_cache[str(session.session_id)] = (time.monotonic() + SESSION_CACHE_TTL_SECONDS, replace(session))
+        return session
     
     async def update_research_session(
         self,
@@ -160,73 +650,59 @@ class DatabaseClient:
         token_usage: Optional[int] = None
     ) -> bool:
         """Update research session"""
-        updates = []
+        columns = []
+        now_columns = []
         params = []
-        param_idx = 1
         
         if status:
-            updates.append(f"status = ${param_idx}")
-            params.append(status.value)
-            param_idx += 1
+            columns.append('status')
+            params.append(status)
             
         if status in [SessionStatus.COMPLETED, SessionStatus.FAILED, SessionStatus.CANCELLED]:
-            updates.append(f"completed_at = ${param_idx}")
-            params.append(datetime.utcnow())
-            param_idx += 1
+            now_columns.append('completed_at')
             
         if research_plan:
-            updates.append(f"research_plan = ${param_idx}")
-            params.append(json.dumps(research_plan))
-            param_idx += 1
+            columns.append('research_plan')
+            params.append(await self._externalize(research_plan))
             
         if final_outcome:
-            updates.append(f"final_outcome = ${param_idx}")
-            params.append(json.dumps(final_outcome))
-            param_idx += 1
+            columns.append('final_outcome')
+            params.append(await self._externalize(final_outcome))
             
         if token_usage is not None:
-            updates.append(f"token_usage = ${param_idx}")
+            columns.append('token_usage')
             params.append(token_usage)
-            param_idx += 1
         
-        if not updates:
+        if not columns:
             return False
             
-        query = f"""
-            UPDATE research_sessions 
-            SET {', '.join(updates)}
-            WHERE session_id = ${param_idx}
-        """
+        query = _build_update_sql('research_sessions', 'session_id', tuple(columns), tuple(now_columns))
         params.append(session_id)
         
-        async with self.pool.acquire() as conn:
+        # Don't wait for the NOTIFY round trip to forget our own write
+        self._session_cache.pop(str(session_id), None)
+        
+        async with self._acquire() as conn:
             result = await conn.execute(query, *params)
-            return result.split()[-1] == '1'
+            return result == 'UPDATE 1'
     
     async def get_research_session(self, session_id: str) -> Optional[ResearchSession]:
         """Get research session by ID"""
-        query = """
-            SELECT session_id, user_id, initial_query, research_plan, final_outcome,
-                   token_usage, session_duration, status, created_at, completed_at
-            FROM research_sessions 
-            WHERE session_id = $1
-        """
-        row = await self.execute_single(query, session_id)
+        cache_key = str(session_id)
+        cached = self._session_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return replace(cached[1])
+        
+        row = await self.execute_single(GET_RESEARCH_SESSION_SQL, session_id)
         if not row:
             return None
-            
-        return ResearchSession(
-            session_id=row['session_id'],
-            user_id=row['user_id'],
-            initial_query=row['initial_query'],
-            research_plan=json.loads(row['research_plan']) if row['research_plan'] else None,
-            final_outcome=json.loads(row['final_outcome']) if row['final_outcome'] else None,
-            token_usage=row['token_usage'],
-            session_duration=row['session_duration'],
-            status=SessionStatus(row['status']),
-            created_at=row['created_at'],
-            completed_at=row['completed_at']
-        )
+        
+        session = _research_session_from_row(row)
+        await self._resolve_payloads([session], RESEARCH_SESSION_PAYLOAD_FIELDS)
+        if len(self._session_cache) >= SESSION_CACHE_MAX_ENTRIES:
+            self._session_cache.clear()
+        self._session_cache[cache_key] = (time.monotonic() + SESSION_CACHE_TTL_SECONDS, replace(session))
+        return session
     
     # Subagent Executions
     async def create_subagent_execution(
@@ -237,13 +713,39 @@ class DatabaseClient:
         tool_calls: Optional[Dict] = None
     ) -> str:
         """Create new subagent execution record"""
-        query = """
-            INSERT INTO subagent_executions (session_id, agent_type, task_description, tool_calls)
-            VALUES ($1, $2, $3, $4)
-            RETURNING execution_id
+        return await self.execute_value(
+            INSERT_SUBAGENT_EXECUTION_SQL, session_id, agent_type, task_description, await self._externalize(tool_calls)
+        )
+    
+    async def create_subagent_executions_bulk(self, executions: List[Dict[str, Any]]) -> List[str]:
+        """Create several subagent execution records in one round trip
+        
+        Each execution is a dict with ``session_id``, ``agent_type`` and
+        ``task_description``, plus optional ``tool_calls``. Returns the new
+        execution IDs in input order.
         """
-        calls_json = json.dumps(tool_calls) if tool_calls else None
-        return await self.execute_value(query, session_id, agent_type.value, task_description, calls_json)
+        if not executions:
+            return []
+        
+        # IDs are generated here so COPY, which can't return rows, still reports them
+        execution_ids = [str(uuid.uuid4()) for _ in executions]
+        records = [
+            (
+                execution_id,
+                execution['session_id'],
+                execution['agent_type'],
+                execution['task_description'],
+                await self._externalize(execution.get('tool_calls'))
+            )
+            for execution_id, execution in zip(execution_ids, executions)
+        ]
+        
+        await self._bulk_insert(
+            'subagent_executions',
+            ['execution_id', 'session_id', 'agent_type', 'task_description', 'tool_calls'],
+            records
+        )
+        return execution_ids
     
     async def update_subagent_execution(
         self,
@@ -254,77 +756,102 @@ class DatabaseClient:
         error_message: Optional[str] = None
     ) -> bool:
         """Update subagent execution"""
-        updates = []
+        columns = []
+        now_columns = []
         params = []
-        param_idx = 1
         
         if status:
-            updates.append(f"status = ${param_idx}")
-            params.append(status.value)
-            param_idx += 1
+            columns.append('status')
+            params.append(status)
             
         if status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED]:
-            updates.append(f"completed_at = ${param_idx}")
-            params.append(datetime.utcnow())
-            param_idx += 1
+            now_columns.append('completed_at')
             
         if results:
-            updates.append(f"results = ${param_idx}")
-            params.append(json.dumps(results))
-            param_idx += 1
+            columns.append('results')
+            params.append(await self._externalize(results))
             
         if execution_time_ms is not None:
-            updates.append(f"execution_time_ms = ${param_idx}")
+            columns.append('execution_time_ms')
             params.append(execution_time_ms)
-            param_idx += 1
             
         if error_message:
-            updates.append(f"error_message = ${param_idx}")
+            columns.append('error_message')
             params.append(error_message)
-            param_idx += 1
         
-        if not updates:
+        if not columns:
             return False
             
-        query = f"""
-            UPDATE subagent_executions 
-            SET {', '.join(updates)}
-            WHERE execution_id = ${param_idx}
-        """
+        query = _build_update_sql('subagent_executions', 'execution_id', tuple(columns), tuple(now_columns))
         params.append(execution_id)
         
-        async with self.pool.acquire() as conn:
+        async with self._acquire() as conn:
             result = await conn.execute(query, *params)
-            return result.split()[-1] == '1'
+            return result == 'UPDATE 1'
     
-    async def get_session_executions(self, session_id: str) -> List[SubagentExecution]:
-        """Get all subagent executions for a session"""
-        query = """
-            SELECT execution_id, session_id, agent_type, task_description, tool_calls, 
-                   results, status, execution_time_ms, error_message, created_at, completed_at
-            FROM subagent_executions 
-            WHERE session_id = $1
-            ORDER BY created_at
+    async def bulk_update_subagent_executions(self, updates: List[Dict[str, Any]]) -> None:
+        """Apply several subagent execution updates in a single transaction
+        
+        Each update is a dict with an ``execution_id`` plus any of the optional
+        fields accepted by update_subagent_execution (status, results,
+        execution_time_ms, error_message). Fields left unset keep their value.
         """
-        rows = await self.execute_query(query, session_id)
-        
-        executions = []
-        for row in rows:
-            executions.append(SubagentExecution(
-                execution_id=row['execution_id'],
-                session_id=row['session_id'],
-                agent_type=AgentType(row['agent_type']),
-                task_description=row['task_description'],
-                tool_calls=json.loads(row['tool_calls']) if row['tool_calls'] else None,
-                results=json.loads(row['results']) if row['results'] else None,
-                status=ExecutionStatus(row['status']),
-                execution_time_ms=row['execution_time_ms'],
-                error_message=row['error_message'],
-                created_at=row['created_at'],
-                completed_at=row['completed_at']
+        if not updates:
+            return
+        
+        args = []
+        for update in updates:
+            status = update.get('status')
+            results = update.get('results')
+            args.append((
+                update['execution_id'],
+                status,
+                status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED],
+                await self._externalize(results),
+                update.get('execution_time_ms'),
+                update.get('error_message') or None
             ))
         
-        return executions
+        async with self._acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(BULK_UPDATE_SUBAGENT_EXECUTIONS_SQL, args)
+    
+    async def get_session_executions(self, session_id: str) -> List[SubagentExecution]:
+        """Get all subagent executions for a session"""
+        rows = await self.execute_query(GET_SESSION_EXECUTIONS_SQL, session_id)
+        
+        return await self._resolve_payloads(
+            [_subagent_execution_from_row(row) for row in rows], SUBAGENT_EXECUTION_PAYLOAD_FIELDS
+        )
+    
+    async def get_session_executions_json(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get a session's executions as status dicts projected by the database"""
+        return await self.execute_value(GET_SESSION_EXECUTIONS_JSON_SQL, session_id)
+    
+    async def get_session_with_executions(
+        self,
+        session_id: str
+    ) -> Tuple[Optional[ResearchSession], List[SubagentExecution]]:
+        """Get a session and its subagent executions, fetched concurrently"""
+        return await asyncio.gather(
+            self.get_research_session(session_id),
+            self.get_session_executions(session_id)
+        )
+    
+    async def iter_session_executions(self, session_id: str) -> AsyncIterator[SubagentExecution]:
+        """Stream subagent executions for a session through a server-side cursor
+        
+        Use this for long sessions; rows arrive in batches so memory stays
+        bounded and the first execution is available before the rest are read.
+        """
+        async with self._acquire() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(
+                    GET_SESSION_EXECUTIONS_SQL, session_id, prefetch=EXECUTION_CURSOR_PREFETCH
+                ):
+                    execution = _subagent_execution_from_row(row)
+                    await self._resolve_payloads([execution], SUBAGENT_EXECUTION_PAYLOAD_FIELDS)
+                    yield execution
     
     # Session Memory
     async def store_session_memory(
@@ -333,16 +860,49 @@ class DatabaseClient:
         memory_type: MemoryType,
         content: Optional[Dict] = None,
         artifact_path: Optional[str] = None,
-        expires_at: Optional[datetime] = None
+        expires_at: Optional[datetime] = None,
+        embedding: Optional[List[float]] = None
     ) -> str:
-        """Store session memory"""
-        query = """
-            INSERT INTO session_memory (session_id, memory_type, content, artifact_path, expires_at)
-            VALUES ($1, $2, $3, $4, $5)
-            RETURNING memory_id
+        """Store session memory, with an embedding for top-K retrieval if given"""
+        content = await self._externalize(content)
+        if embedding is not None:
+            return await self.execute_value(
+                INSERT_SESSION_MEMORY_WITH_EMBEDDING_SQL,
+                session_id, memory_type, content, artifact_path, expires_at, _vector_literal(embedding)
+            )
+        return await self.execute_value(
+            INSERT_SESSION_MEMORY_SQL, session_id, memory_type, content, artifact_path, expires_at
+        )
+    
+    async def store_session_memory_bulk(self, memories: List[Dict[str, Any]]) -> List[str]:
+        """Store several session memory entries in one round trip
+        
+        Each memory is a dict with ``session_id`` and ``memory_type``, plus any
+        of the optional ``content``, ``artifact_path`` and ``expires_at``.
+        Returns the new memory IDs in input order.
         """
-        content_json = json.dumps(content) if content else None
-        return await self.execute_value(query, session_id, memory_type.value, content_json, artifact_path, expires_at)
+        if not memories:
+            return []
+        
+        memory_ids = [str(uuid.uuid4()) for _ in memories]
+        records = [
+            (
+                memory_id,
+                memory['session_id'],
+                memory['memory_type'],
+                await self._externalize(memory.get('content')),
+                memory.get('artifact_path'),
+                memory.get('expires_at')
+            )
+            for memory_id, memory in zip(memory_ids, memories)
+        ]
+        
+        await self._bulk_insert(
+            'session_memory',
+            ['memory_id', 'session_id', 'memory_type', 'content', 'artifact_path', 'expires_at'],
+            records
+        )
+        return memory_ids
     
     async def get_session_memory(
         self, 
@@ -351,72 +911,60 @@ class DatabaseClient:
     ) -> List[SessionMemory]:
         """Get session memory, optionally filtered by type"""
         if memory_type:
-            query = """
-                SELECT memory_id, session_id, memory_type, content, artifact_path, created_at, expires_at
-                FROM session_memory 
-                WHERE session_id = $1 AND memory_type = $2
-                AND (expires_at IS NULL OR expires_at > NOW())
-                ORDER BY created_at DESC
-            """
-            rows = await self.execute_query(query, session_id, memory_type.value)
+            rows = await self.execute_query(GET_SESSION_MEMORY_BY_TYPE_SQL, session_id, memory_type)
         else:
-            query = """
-                SELECT memory_id, session_id, memory_type, content, artifact_path, created_at, expires_at
-                FROM session_memory 
-                WHERE session_id = $1
-                AND (expires_at IS NULL OR expires_at > NOW())
-                ORDER BY created_at DESC
-            """
-            rows = await self.execute_query(query, session_id)
-        
-        memories = []
-        for row in rows:
-            memories.append(SessionMemory(
-                memory_id=row['memory_id'],
-                session_id=row['session_id'],
-                memory_type=MemoryType(row['memory_type']),
-                content=json.loads(row['content']) if row['content'] else None,
-                artifact_path=row['artifact_path'],
-                created_at=row['created_at'],
-                expires_at=row['expires_at']
-            ))
+            rows = await self.execute_query(GET_SESSION_MEMORY_SQL, session_id)
         
-        return memories
+        return await self._resolve_payloads(
+            [_session_memory_from_row(row) for row in rows], SESSION_MEMORY_PAYLOAD_FIELDS
+        )
+    
+    async def get_session_memory_summary(self, session_id: str) -> Tuple[int, str]:
+        """Get the number of live session memories and a version tag for that set"""
+        row = await self.execute_single(GET_SESSION_MEMORY_SUMMARY_SQL, session_id)
+        return row[0], row[1]
+    
+    async def get_top_k_session_memory(
+        self,
+        session_id: str,
+        query_embedding: List[float],
+        k: int = 50
+    ) -> List[SessionMemory]:
+        """Get the k session memories most similar to the query embedding"""
+        rows = await self.execute_query(
+            GET_TOP_K_SESSION_MEMORY_SQL, session_id, _vector_literal(query_embedding), k
+        )
+        return await self._resolve_payloads(
+            [_session_memory_from_row(row) for row in rows], SESSION_MEMORY_PAYLOAD_FIELDS
+        )
+    
+    # Plan Cache
+    async def plan_cache_lookup(
+        self,
+        query_embedding: List[float],
+        research_mode: str,
+        min_similarity: float
+    ) -> Optional[Dict]:
+        """Return the cached plan nearest to the query embedding, if similar enough"""
+        return await self.execute_value(
+            PLAN_CACHE_LOOKUP_SQL, research_mode, _vector_literal(query_embedding), min_similarity
+        )
+    
+    async def plan_cache_store(
+        self,
+        query_embedding: List[float],
+        research_mode: str,
+        plan: Dict
+    ) -> None:
+        """Cache a research plan under its query embedding"""
+        async with self._acquire() as conn:
+            await conn.execute(PLAN_CACHE_STORE_SQL, _vector_literal(query_embedding), research_mode, plan)
     
     # Analytics and Monitoring
     async def get_session_analytics(self, days: int = 7) -> Dict[str, Any]:
         """Get session analytics for the last N days"""
-        query = """
-            SELECT 
-                COUNT(*) as total_sessions,
-                COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_sessions,
-                COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed_sessions,
-                AVG(token_usage) as avg_token_usage,
-                AVG(EXTRACT(EPOCH FROM session_duration)) as avg_duration_seconds
-            FROM research_sessions 
-            WHERE created_at > NOW() - INTERVAL '%s days'
-        """ % days
-        
-        row = await self.execute_single(query)
-        
-        # Get subagent performance
-        subagent_query = """
-            SELECT 
-                agent_type,
-                COUNT(*) as total_executions,
-                COUNT(CASE WHEN status = 'completed' THEN 1 END) as successful_executions,
-                AVG(execution_time_ms) as avg_execution_time_ms
-            FROM subagent_executions 
-            WHERE created_at > NOW() - INTERVAL '%s days'
-            GROUP BY agent_type
-        """ % days
-        
-        subagent_rows = await self.execute_query(subagent_query)
-        
-        return {
-            'session_stats': dict(row),
-            'subagent_stats': [dict(row) for row in subagent_rows]
-        }
+        # Session and subagent stats come back together as one JSONB document
+        return await self.execute_value(SESSION_ANALYTICS_SQL, days)
 
 # Global database client instance
 db_client = DatabaseClient() 
\ No newline at end of file
@@ -14,11 +14,23 @@ Environment Variables:
     AZURE_OPENAI_ENDPOINT: The Azure OpenAI endpoint URL
     AZURE_OPENAI_DEPLOYMENT: The Azure OpenAI deployment name to use
     AZURE_OPENAI_API_VERSION: The Azure OpenAI API version to use
+    AZURE_OPENAI_MAX_RETRIES: Retries on rate limits and connection errors (default: 5)
+    AZURE_OPENAI_STRUCTURED_OUTPUTS: Use strict JSON schemas; needs API version 2024-08-01-preview+ (default: true)
+    AZURE_OPENAI_EMBEDDING_DEPLOYMENT: Embedding deployment for the plan cache (default: text-embedding-3-small)
+    PLAN_CACHE_ENABLED: Reuse plans of similar earlier queries; needs pgvector (default: false)
+    PLAN_CACHE_MIN_SIMILARITY: Cosine similarity needed for a plan cache hit (default: 0.90)
+    SEMANTIC_CACHE_ENABLED: Cache query intent analyses in Redis; needs RediSearch (default: false)
+    SEMANTIC_CACHE_MIN_SIMILARITY: Cosine similarity needed for a semantic cache hit (default: 0.95)
     POSTGRES_HOST: PostgreSQL host (default: localhost)
     POSTGRES_PORT: PostgreSQL port (default: 5432)
     POSTGRES_DB: PostgreSQL database name (default: dataflow_agents)
     POSTGRES_USER: PostgreSQL username (default: postgres)
     POSTGRES_PASSWORD: PostgreSQL password (default: postgres)
+    POSTGRES_POOL_MIN: Minimum pooled connections (default: 5)
+    POSTGRES_POOL_MAX: Maximum pooled connections (default: 2 per CPU core + 4)
+    AGENT_ARTIFACT_DIR: Absolute, shared directory for JSON payloads over 64KB (default: unset, kept inline)
+    LANGRAPH_AGENTS_ENDPOINT: Langraph agents service URL (default: http://localhost:8001)
+    DEMO_MCP_ENDPOINT: Demo MCP server used as a fallback (default: http://localhost:8080)
     REDIS_HOST: Redis host (default: localhost)
     REDIS_PORT: Redis port (default: 6379)
     MCP_SERVER_PORT: Port to run the server on (default: 8080)
@@ -30,7 +42,11 @@ import logging
 import asyncio
 import json
 import time
-from typing import Dict, List, Optional, Any, Literal
+import hashlib
+import textwrap
+from array import array
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any, Literal, Callable, Awaitable, Final
 from datetime import datetime
 from pathlib import Path
 
@@ -39,28 +55,64 @@ try:
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
-    # Fallback: manually load .env file if python-dotenv is not available
+    # Fallback: manually load .env file if python-dotenv is not available.
+    # Lines are scanned as bytes and only decoded once they hold a KEY=VALUE pair.
     env_file = Path(__file__).parent / '.env'
     if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+        for raw in env_file.read_bytes().splitlines():
+            raw = raw.strip()
+            if not raw or raw.startswith(b'#'):
+                continue
+            eq = raw.find(b'=')
+            if eq < 0:
+                continue
+            os.environ[raw[:eq].strip().decode()] = raw[eq + 1:].strip().decode()
 
 from fastmcp import FastMCP, Context
-from openai import AsyncAzureOpenAI
+from openai import AsyncAzureOpenAI, BadRequestError
 import httpx
 
+# Redis backs the semantic response cache when it is installed
+try:
+    from redis.asyncio import Redis
+    from redis.commands.search.field import VectorField
+    from redis.commands.search.query import Query
+    try:
+        from redis.commands.search.index_definition import IndexDefinition, IndexType
+    except ImportError:
+        from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+except ImportError:
+    Redis = None
+
+# Prefer orjson for JSON on the request path when it is installed
+try:
+    import orjson
+    _dump_json = orjson.dumps
+    _load_json = orjson.loads
+except ImportError:
+    def _dump_json(value: Any) -> bytes:
+        return json.dumps(value, default=asdict).encode('utf-8')
+    
+    _load_json = json.loads
+
+# Headers for POSTing a body already encoded with _dump_json
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Import local database client
-from db_client import db_client, SessionStatus, AgentType, ExecutionStatus
+from database import db_client, SessionStatus, AgentType, ExecutionStatus, MemoryType
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging; records are emitted as JSON objects when python-json-logger is installed
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+try:
+    try:
+        from pythonjsonlogger.json import JsonFormatter
+    except ImportError:
+        from pythonjsonlogger.jsonlogger import JsonFormatter
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(JsonFormatter(LOG_FORMAT))
+    logging.basicConfig(level=logging.INFO, handlers=[log_handler])
+except ImportError:
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 # Validate required environment variables
@@ -79,11 +131,85 @@ for var in required_env_vars:
 openai_client = AsyncAzureOpenAI(
     api_key=os.getenv("AZURE_OPENAI_API_KEY"),
     api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
+    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+    # SDK retries 429s and connection errors with exponential backoff and jitter
+    max_retries=int(os.getenv("AZURE_OPENAI_MAX_RETRIES", "5"))
 )
 
-# HTTP client for calling langraph agents
-http_client = httpx.AsyncClient(timeout=300.0)  # 5 minute timeout for complex research
+# Deployment and service endpoints, resolved once at import
+AZURE_DEPLOYMENT = os.environ["AZURE_OPENAI_DEPLOYMENT"]
+LANGRAPH_ENDPOINT = os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001")
+LANGRAPH_EXEC_URL = f"{LANGRAPH_ENDPOINT}/execute_research"
+LANGRAPH_HEALTH_URL = f"{LANGRAPH_ENDPOINT}/health"
+DEMO_ENDPOINT = os.getenv("DEMO_MCP_ENDPOINT", "http://localhost:8080")
+DEMO_ASK_AI_URL = f"{DEMO_ENDPOINT}/ask_ai"
+
+# Research plans of near-duplicate queries are reused from the pgvector plan cache
+PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+PLAN_CACHE_MIN_SIMILARITY = float(os.getenv("PLAN_CACHE_MIN_SIMILARITY", "0.90"))
+EMBEDDING_DEPLOYMENT = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-3-small")
+
+# Model responses for the same or similar queries are reused from Redis for a day
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+SEMANTIC_CACHE_MIN_SIMILARITY = float(os.getenv("SEMANTIC_CACHE_MIN_SIMILARITY", "0.95"))
+SEMANTIC_CACHE_TTL_SECONDS = 24 * 60 * 60
+EMBEDDING_DIMENSIONS = 1536
+
+redis_client = Redis(
+    host=os.getenv("REDIS_HOST", "localhost"),
+    port=int(os.getenv("REDIS_PORT", 6379)),
+    socket_connect_timeout=1.0,
+    socket_timeout=1.0
+) if Redis is not None and SEMANTIC_CACHE_ENABLED else None
+
+# Namespaces whose RediSearch vector index is known to exist
+_semantic_cache_indexes: set = set()
+
+@dataclass(slots=True)
+class ExecuteResearchRequest:
+    """Body of the langraph agents /execute_research call"""
+    session_id: str
+    query: str
+    research_plan: Dict[str, Any]
+
+# A shared research run fans its progress out to every caller waiting on it
+@dataclass(slots=True)
+class InflightResearch:
+    """A running multi_agent_research call and the callers waiting on it"""
+    task: Optional[asyncio.Task] = None
+    contexts: List[Context] = field(default_factory=list)
+    
+    async def report_progress(self, progress: float):
+        """Report progress to every waiting caller, dropping any that fail"""
+        for ctx in list(self.contexts):
+            try:
+                await ctx.report_progress(progress)
+            except Exception as e:
+                logger.warning("Dropping progress listener: %s", e)
+                if ctx in self.contexts:
+                    self.contexts.remove(ctx)
+
+# Running multi_agent_research calls, keyed by a hash of their arguments
+_inflight_research: Dict[str, InflightResearch] = {}
+
+# Successful health probes are reused for a while so frequent health polling
+# doesn't hit Azure OpenAI or the agents service on every call
+OPENAI_PROBE_TTL_SECONDS = 30.0
+LANGRAPH_PROBE_TTL_SECONDS = 10.0
+_last_openai_probe: Dict[str, Any] = {"ts": float("-inf"), "status": None}
+_last_langraph_probe: Dict[str, Any] = {"ts": float("-inf"), "status": None}
+
+# HTTP client for calling langraph agents.
+# HTTP/2 multiplexes concurrent agent calls over a few pooled connections. Limits and
+# http2 go on the transport, since the client ignores them when a transport is given.
+http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(300.0, connect=5.0),  # 5 minute timeout for complex research
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=200, keepalive_expiry=60.0),
+        retries=2  # connection failures only
+    )
+)
 
 # Create FastMCP server
 mcp = FastMCP(
@@ -110,15 +236,138 @@ mcp = FastMCP(
     """
 )
 
+# Static prompts, dedented once at import so no indentation whitespace is sent
+# to the model and the system prefix stays byte-identical for prompt caching
+INTENT_SYSTEM_PROMPT: Final[str] = textwrap.dedent("""
+    You are a query intent analyzer for a multi-agent research system. Analyze the user's query and determine:
+    
+    1. Research type: metadata exploration, data retrieval, cross-source analysis, or general inquiry
+    2. Data sources likely needed: databases, APIs, documents, etc.
+    3. Required agents: metadata, entitlement, data, aggregation
+    4. Complexity level: simple (1-2 agents), moderate (2-3 agents), complex (3-4 agents)
+    5. Recommended research mode: metadata, data, analysis, or full
+    
+    Respond with a JSON object containing your analysis.
+""").strip()
+
+INTENT_USER_PROMPT: Final[str] = textwrap.dedent("""
+    Analyze this query and provide research recommendations:
+    
+    Query: "{query}"
+    
+    Provide analysis in this JSON format:
+    {{
+        "research_type": "metadata|data|analysis|inquiry",
+        "complexity_level": "simple|moderate|complex", 
+        "recommended_mode": "metadata|data|analysis|full",
+        "required_agents": ["metadata", "entitlement", "data", "aggregation"],
+        "data_sources": ["source1", "source2"],
+        "strategy_notes": "Brief explanation of recommended approach"
+    }}
+""").strip()
+
+PLAN_SYSTEM_PROMPT: Final[str] = textwrap.dedent("""
+    You are a research strategist for a multi-agent system. Create a detailed research plan that will guide specialized agents.
+    
+    Consider:
+    - What information is needed to answer the query
+    - Which data sources should be explored
+    - What metadata discovery is required
+    - How to break down the work for parallel execution
+    - What entitlement checks are needed
+    
+    Create a plan that maximizes parallel execution while ensuring thorough coverage.
+""").strip()
+
+PLAN_USER_PROMPT: Final[str] = textwrap.dedent("""
+    Create a research plan for this query in {research_mode} mode:
+    
+    Query: "{query}"
+    Mode: {research_mode}
+    
+    Provide a JSON research plan with:
+    {{
+        "objective": "Clear research objective",
+        "approach": "Overall strategy",
+        "agent_tasks": {{
+            "metadata": "Specific task for metadata agent",
+            "entitlement": "Specific task for entitlement agent", 
+            "data": "Specific task for data agent",
+            "aggregation": "Specific task for aggregation agent"
+        }},
+        "execution_order": ["parallel_group_1", "parallel_group_2"],
+        "success_criteria": "How to measure successful completion"
+    }}
+""").strip()
+
+# System turns built once; per-call text only ever goes in the user turn, so the
+# leading system message is the same object on every request
+INTENT_SYSTEM_MESSAGE: Final[Dict[str, str]] = {"role": "system", "content": INTENT_SYSTEM_PROMPT}
+PLAN_SYSTEM_MESSAGE: Final[Dict[str, str]] = {"role": "system", "content": PLAN_SYSTEM_PROMPT}
+
+def _strict_json_schema(name: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Structured-output response format requiring exactly the given properties"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
+                "additionalProperties": False
+            }
+        }
+    }
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+# Strict json_schema needs API version 2024-08-01-preview or later and a model that
+# supports structured outputs; otherwise completions fall back to plain JSON mode
+JSON_OBJECT_FORMAT: Final[Dict[str, str]] = {"type": "json_object"}
+_structured_outputs_enabled = os.getenv("AZURE_OPENAI_STRUCTURED_OUTPUTS", "true").lower() in ("1", "true", "yes")
+
+# Response schemas matching the JSON shapes described in the prompts above
+INTENT_RESPONSE_FORMAT = _strict_json_schema("intent_analysis", {
+    "research_type": {"type": "string", "enum": ["metadata", "data", "analysis", "inquiry"]},
+    "complexity_level": {"type": "string", "enum": ["simple", "moderate", "complex"]},
+    "recommended_mode": {"type": "string", "enum": ["metadata", "data", "analysis", "full"]},
+    "required_agents": {
+        "type": "array",
+        "items": {"type": "string", "enum": ["metadata", "entitlement", "data", "aggregation"]}
+    },
+    "data_sources": _STRING_LIST,
+    "strategy_notes": _STRING
+})
+
+PLAN_RESPONSE_FORMAT = _strict_json_schema("research_plan", {
+    "objective": _STRING,
+    "approach": _STRING,
+    "agent_tasks": {
+        "type": "object",
+        "properties": {agent: _STRING for agent in ("metadata", "entitlement", "data", "aggregation")},
+        "required": ["metadata", "entitlement", "data", "aggregation"],
+        "additionalProperties": False
+    },
+    "execution_order": _STRING_LIST,
+    "success_criteria": _STRING
+})
+
 @mcp.tool
 async def multi_agent_research(
     query: str,
     user_email: str = "default@example.com",
     session_id: Optional[str] = None,
-    research_mode: Literal["metadata", "data", "analysis", "full"] = "full"
+    research_mode: Literal["metadata", "data", "analysis", "full"] = "full",
+    ctx: Optional[Context] = None
 ) -> Dict[str, Any]:
     """Perform multi-agent research across data sources using specialized AI agents.
     
+    Progress is reported to the client as agent events stream in. Identical
+    concurrent calls share one run and all receive its progress.
+    
     Args:
         query: Natural language research query or request
         user_email: User identifier for session tracking and entitlements
@@ -135,14 +384,51 @@ async def multi_agent_research(
     if not query.strip():
         return {"error": "Query cannot be empty"}
     
-    logger.info(f"Starting multi-agent research for query: {query[:100]}...")
+    # Identical concurrent requests share one run. The check and insert have no
+    # await between them, so no lock is needed on the event loop.
+    key = hashlib.sha256(f"{user_email}|{research_mode}|{session_id}|{query}".encode("utf-8")).hexdigest()
+    run = _inflight_research.get(key)
+    if run is None:
+        run = InflightResearch()
+        run.task = asyncio.create_task(
+            _run_research(query, user_email, session_id, research_mode, run.report_progress)
+        )
+        _inflight_research[key] = run
+        run.task.add_done_callback(lambda _: _inflight_research.pop(key, None))
+    else:
+        logger.info("Joining in-flight research for query: %s...", query[:100])
+    
+    # The shared run holds no caller's context; progress fans out to whoever
+    # is still waiting, and a caller that goes away stops receiving it
+    if ctx is not None:
+        run.contexts.append(ctx)
+    try:
+        # Shielded so a cancelled caller doesn't cancel the run for the others
+        return await asyncio.shield(run.task)
+    finally:
+        if ctx is not None and ctx in run.contexts:
+            run.contexts.remove(ctx)
+
+async def _run_research(
+    query: str,
+    user_email: str,
+    session_id: Optional[str],
+    research_mode: str,
+    report_progress: Optional[Callable[[float], Awaitable[None]]]
+) -> Dict[str, Any]:
+    """Run one multi-agent research request end to end"""
+    logger.info("Starting multi-agent research for query: %s...", query[:100])
     start_time = time.time()
+    plan_task = None
     
     try:
         # Initialize database connection if needed
         if not db_client.pool:
             await db_client.connect()
         
+        # The plan only needs the query, so develop it while the session is set up
+        plan_task = asyncio.create_task(_develop_research_plan(query, research_mode))
+        
         # Get or create user
         user_id = await db_client.get_or_create_user(user_email)
         
@@ -150,36 +436,38 @@ async def multi_agent_research(
         if session_id:
             session = await db_client.get_research_session(session_id)
             if not session:
+                plan_task.cancel()
                 return {"error": f"Session {session_id} not found"}
         else:
-            session_id = await db_client.create_research_session(
+            session = await db_client.create_research_session(
                 user_id=user_id,
                 initial_query=query
             )
+            session_id = session.session_id
         
-        logger.info(f"Research session: {session_id}")
+        logger.info("Research session: %s", session_id)
         
-        # Develop research plan
-        research_plan = await _develop_research_plan(query, research_mode)
-        
-        # Update session with research plan
-        await db_client.update_research_session(
-            session_id=session_id,
-            research_plan=research_plan
-        )
+        research_plan = await plan_task
         
-        # Store research plan in session memory
-        await db_client.store_session_memory(
-            session_id=session_id,
-            memory_type=MemoryType.RESEARCH_PLAN,
-            content=research_plan
+        # Record the plan on the session and in session memory; the writes are independent
+        await asyncio.gather(
+            db_client.update_research_session(
+                session_id=session_id,
+                research_plan=research_plan
+            ),
+            db_client.store_session_memory(
+                session_id=session_id,
+                memory_type=MemoryType.RESEARCH_PLAN,
+                content=research_plan
+            )
         )
         
         # Execute research using langraph agents
         research_results = await _execute_research_plan(
             session_id=session_id,
             research_plan=research_plan,
-            query=query
+            query=query,
+            report_progress=report_progress
         )
         
         # Calculate execution time and token usage
@@ -207,12 +495,15 @@ async def multi_agent_research(
             token_usage=total_tokens
         )
         
-        logger.info(f"Research completed in {execution_time}ms with {total_tokens} tokens")
+        logger.info("Research completed in %sms with %s tokens", execution_time, total_tokens)
         
         return final_outcome
         
     except Exception as e:
-        logger.error(f"Multi-agent research error: {str(e)}")
+        logger.error("Multi-agent research error: %s", e)
+        
+        if plan_task is not None:
+            plan_task.cancel()
         
         # Update session as failed if we have session_id
         if session_id:
@@ -239,68 +530,27 @@ async def analyze_query_intent(query: str) -> Dict[str, Any]:
     if not query.strip():
         return {"error": "Query cannot be empty"}
     
-    logger.info(f"Analyzing query intent: {query[:100]}...")
-    
-    system_prompt = """
-    You are a query intent analyzer for a multi-agent research system. Analyze the user's query and determine:
-    
-    1. Research type: metadata exploration, data retrieval, cross-source analysis, or general inquiry
-    2. Data sources likely needed: databases, APIs, documents, etc.
-    3. Required agents: metadata, entitlement, data, aggregation
-    4. Complexity level: simple (1-2 agents), moderate (2-3 agents), complex (3-4 agents)
-    5. Recommended research mode: metadata, data, analysis, or full
-    
-    Respond with a JSON object containing your analysis.
-    """
-    
-    user_prompt = f"""
-    Analyze this query and provide research recommendations:
-    
-    Query: "{query}"
+    logger.info("Analyzing query intent: %s...", query[:100])
     
-    Provide analysis in this JSON format:
-    {{
-        "research_type": "metadata|data|analysis|inquiry",
-        "complexity_level": "simple|moderate|complex", 
-        "recommended_mode": "metadata|data|analysis|full",
-        "required_agents": ["metadata", "entitlement", "data", "aggregation"],
-        "data_sources": ["source1", "source2"],
-        "strategy_notes": "Brief explanation of recommended approach"
-    }}
-    """
+    user_prompt = INTENT_USER_PROMPT.format(query=query)
     
     try:
-        response = await openai_client.chat.completions.create(
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3,
-            max_tokens=500
+        intent_analysis = await _semantic_cache_get_or_compute(
+            "intent_cache",
+            query,
+            lambda: _chat_completion_json(
+                INTENT_SYSTEM_MESSAGE,
+                user_prompt,
+                INTENT_RESPONSE_FORMAT,
+                max_tokens=500
+            )
         )
         
-        result_text = response.choices[0].message.content
-        
-        # Try to parse JSON response
-        try:
-            intent_analysis = json.loads(result_text)
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            intent_analysis = {
-                "research_type": "inquiry",
-                "complexity_level": "moderate",
-                "recommended_mode": "full",
-                "required_agents": ["metadata", "data"],
-                "data_sources": ["unknown"],
-                "strategy_notes": "Could not parse detailed analysis, using default approach"
-            }
-        
         logger.info("Query intent analysis completed")
         return intent_analysis
         
     except Exception as e:
-        logger.error(f"Intent analysis error: {str(e)}")
+        logger.error("Intent analysis error: %s", e)
         return {"error": f"Intent analysis failed: {str(e)}"}
 
 @mcp.tool
@@ -317,17 +567,15 @@ async def get_session_status(session_id: str) -> Dict[str, Any]:
         if not db_client.pool:
             await db_client.connect()
         
-        # Get session details
-        session = await db_client.get_research_session(session_id)
+        # The three lookups are independent, so overlap them on pooled connections
+        session, executions, (memory_count, memory_version) = await asyncio.gather(
+            db_client.get_research_session(session_id),
+            db_client.get_session_executions_json(session_id),
+            db_client.get_session_memory_summary(session_id)
+        )
         if not session:
             return {"error": f"Session {session_id} not found"}
         
-        # Get subagent executions
-        executions = await db_client.get_session_executions(session_id)
-        
-        # Get session memory
-        memories = await db_client.get_session_memory(session_id)
-        
         status_info = {
             "session_id": session_id,
             "status": session.status.value,
@@ -336,24 +584,16 @@ async def get_session_status(session_id: str) -> Dict[str, Any]:
             "completed_at": session.completed_at.isoformat() if session.completed_at else None,
             "token_usage": session.token_usage,
             "research_plan": session.research_plan,
-            "subagent_executions": [
-                {
-                    "execution_id": exec.execution_id,
-                    "agent_type": exec.agent_type.value,
-                    "status": exec.status.value,
-                    "task_description": exec.task_description,
-                    "execution_time_ms": exec.execution_time_ms,
-                    "error_message": exec.error_message
-                }
-                for exec in executions
-            ],
-            "memory_count": len(memories)
+            "subagent_executions": executions,
+            "memory_count": memory_count,
+            # Changes whenever the session's live memories do
+            "memory_version": memory_version
         }
         
         return status_info
         
     except Exception as e:
-        logger.error(f"Get session status error: {str(e)}")
+        logger.error("Get session status error: %s", e)
         return {"error": f"Failed to get session status: {str(e)}"}
 
 @mcp.tool
@@ -372,48 +612,18 @@ async def health_check() -> Dict[str, Any]:
         "version": "1.0.0-mvp"
     }
     
-    # Test Azure OpenAI connection
-    try:
-        test_response = await openai_client.chat.completions.create(
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
-            messages=[{"role": "user", "content": "Hello"}],
-            max_tokens=10
-        )
-        health_status["azure_openai_status"] = "connected"
-        health_status["azure_openai_model"] = os.getenv("AZURE_OPENAI_DEPLOYMENT")
-    except Exception as e:
-        health_status["azure_openai_status"] = f"error: {str(e)}"
-    
-    # Test database connection
-    try:
-        if not db_client.pool:
-            await db_client.connect()
-        
-        # Test basic query
-        test_result = await db_client.execute_value("SELECT 1")
-        if test_result == 1:
-            health_status["database_status"] = "connected"
-            
-            # Get recent analytics
-            analytics = await db_client.get_session_analytics(days=1)
-            health_status["recent_analytics"] = analytics
-        else:
-            health_status["database_status"] = "error: test query failed"
-            
-    except Exception as e:
-        health_status["database_status"] = f"error: {str(e)}"
-    
-    # Test langraph agents endpoint (if running)
-    try:
-        # This would be the endpoint where langraph agents are running
-        agent_endpoint = os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001")
-        response = await http_client.get(f"{agent_endpoint}/health", timeout=5.0)
-        if response.status_code == 200:
-            health_status["langraph_agents_status"] = "connected"
-        else:
-            health_status["langraph_agents_status"] = f"error: HTTP {response.status_code}"
-    except Exception as e:
-        health_status["langraph_agents_status"] = f"error: {str(e)}"
+    # Probe dependencies concurrently so a slow endpoint doesn't gate the others
+    probe_results = await asyncio.gather(
+        _probe_azure_openai(),
+        _probe_database(),
+        _probe_langraph_agents(),
+        return_exceptions=True
+    )
+    for probe_result in probe_results:
+        if isinstance(probe_result, BaseException):
+            logger.error("Health probe error: %s", probe_result)
+            continue
+        health_status.update(probe_result)
     
     return health_status
 
@@ -440,81 +650,221 @@ async def get_system_analytics(days: int = 7) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Analytics error: {str(e)}")
+        logger.error("Analytics error: %s", e)
         return {"error": f"Failed to get analytics: {str(e)}"}
 
 # Helper functions
 
-async def _develop_research_plan(query: str, research_mode: str) -> Dict[str, Any]:
-    """Develop a research plan for the given query"""
-    system_prompt = """
-    You are a research strategist for a multi-agent system. Create a detailed research plan that will guide specialized agents.
-    
-    Consider:
-    - What information is needed to answer the query
-    - Which data sources should be explored
-    - What metadata discovery is required
-    - How to break down the work for parallel execution
-    - What entitlement checks are needed
+async def _chat_completion_json(
+    system_message: Dict[str, str],
+    user_prompt: str,
+    response_format: Dict[str, Any],
+    max_tokens: int
+) -> Dict[str, Any]:
+    """Run a JSON chat completion and return the parsed object
     
-    Create a plan that maximizes parallel execution while ensuring thorough coverage.
+    Uses the strict ``response_format`` schema when structured outputs are
+    enabled. If the deployment rejects it, that call and all later ones use
+    plain JSON mode instead.
     """
+    global _structured_outputs_enabled
+    messages = [system_message, {"role": "user", "content": user_prompt}]
     
-    user_prompt = f"""
-    Create a research plan for this query in {research_mode} mode:
+    async def create(fmt: Dict[str, Any]):
+        return await openai_client.chat.completions.create(
+            model=AZURE_DEPLOYMENT,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=max_tokens,
+            response_format=fmt
+        )
     
-    Query: "{query}"
-    Mode: {research_mode}
+    if _structured_outputs_enabled:
+        try:
+            response = await create(response_format)
+        except BadRequestError as e:
+            # Only a rejection of the response_format parameter itself disables
+            # structured outputs; other 400s (content filter, bad input) propagate
+            if not (e.param or "").startswith("response_format"):
+                raise
+            logger.warning("Structured outputs rejected, falling back to JSON mode: %s", e)
+            _structured_outputs_enabled = False
+            response = await create(JSON_OBJECT_FORMAT)
+    else:
+        response = await create(JSON_OBJECT_FORMAT)
     
-    Provide a JSON research plan with:
-    {{
-        "objective": "Clear research objective",
-        "approach": "Overall strategy",
-        "agent_tasks": {{
-            "metadata": "Specific task for metadata agent",
-            "entitlement": "Specific task for entitlement agent", 
-            "data": "Specific task for data agent",
-            "aggregation": "Specific task for aggregation agent"
-        }},
-        "execution_order": ["parallel_group_1", "parallel_group_2"],
-        "success_criteria": "How to measure successful completion"
-    }}
-    """
+    choice = response.choices[0]
+    if choice.finish_reason == "length":
+        raise ValueError(f"Completion truncated at max_tokens={max_tokens}")
+    return _load_json(choice.message.content)
+
+async def _embed_text(text: str) -> List[float]:
+    """Embed text with the embedding deployment"""
+    response = await openai_client.embeddings.create(
+        model=EMBEDDING_DEPLOYMENT,
+        input=text
+    )
+    return response.data[0].embedding
+
+async def _ensure_semantic_index(namespace: str):
+    """Create the RediSearch vector index for a cache namespace if it is missing"""
+    if namespace in _semantic_cache_indexes:
+        return
     
+    index = redis_client.ft(f"{namespace}_idx")
     try:
-        response = await openai_client.chat.completions.create(
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3,
-            max_tokens=800
+        await index.info()
+    except Exception:
+        await index.create_index(
+            [VectorField("embedding", "HNSW", {
+                "TYPE": "FLOAT32",
+                "DIM": EMBEDDING_DIMENSIONS,
+                "DISTANCE_METRIC": "COSINE"
+            })],
+            definition=IndexDefinition(prefix=[f"{namespace}:vec:"], index_type=IndexType.HASH)
         )
+    _semantic_cache_indexes.add(namespace)
+
+async def _semantic_cache_get_or_compute(
+    namespace: str,
+    query: str,
+    compute: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Return a cached response for the query, or compute and cache it
+    
+    Exact repeats are found by the SHA1 of the query; otherwise the nearest
+    cached query by embedding is used when it is similar enough. Cache errors
+    never fail the call, they just fall through to ``compute``.
+    """
+    if redis_client is None:
+        return await compute()
+    
+    query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+    exact_key = f"{namespace}:exact:{query_hash}"
+    embedding = None
+    
+    try:
+        cached = await redis_client.get(exact_key)
+        if cached is not None:
+            return _load_json(cached)
+        
+        await _ensure_semantic_index(namespace)
+        embedding = array("f", await _embed_text(query)).tobytes()
+        nearest = Query("*=>[KNN 1 @embedding $vec AS distance]").return_fields("payload", "distance").dialect(2)
+        result = await redis_client.ft(f"{namespace}_idx").search(nearest, query_params={"vec": embedding})
+        # COSINE distance is 1 - similarity
+        if result.docs and 1 - float(result.docs[0].distance) >= SEMANTIC_CACHE_MIN_SIMILARITY:
+            return _load_json(result.docs[0].payload)
+    except Exception as e:
+        logger.warning("Semantic cache lookup failed: %s", e)
+    
+    value = await compute()
+    
+    try:
+        payload = _dump_json(value)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(exact_key, payload, ex=SEMANTIC_CACHE_TTL_SECONDS)
+            if embedding is not None:
+                vector_key = f"{namespace}:vec:{query_hash}"
+                pipe.hset(vector_key, mapping={"payload": payload, "embedding": embedding})
+                pipe.expire(vector_key, SEMANTIC_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Semantic cache store failed: %s", e)
+    
+    return value
+
+async def _probe_azure_openai() -> Dict[str, Any]:
+    """Test Azure OpenAI connection"""
+    if time.monotonic() - _last_openai_probe["ts"] < OPENAI_PROBE_TTL_SECONDS:
+        return _last_openai_probe["status"]
+    
+    try:
+        # Listing models proves the endpoint and key work without running an inference.
+        # No retries and a short timeout, so an outage fails the probe fast.
+        await openai_client.with_options(max_retries=0, timeout=5.0).models.list()
+        status = {
+            "azure_openai_status": "connected",
+            "azure_openai_model": AZURE_DEPLOYMENT
+        }
+        _last_openai_probe.update(ts=time.monotonic(), status=status)
+        return status
+    except Exception as e:
+        return {"azure_openai_status": f"error: {str(e)}"}
+
+async def _probe_database() -> Dict[str, Any]:
+    """Test database connection and collect recent analytics"""
+    try:
+        if not db_client.pool:
+            await db_client.connect()
         
-        plan_text = response.choices[0].message.content
+        async with db_client.session():
+            # Test basic query
+            test_result = await db_client.execute_value("SELECT 1")
+            if test_result != 1:
+                return {"database_status": "error: test query failed"}
+            
+            # Get recent analytics
+            analytics = await db_client.get_session_analytics(days=1)
         
+        return {
+            "database_status": "connected",
+            "recent_analytics": analytics
+        }
+    except Exception as e:
+        return {"database_status": f"error: {str(e)}"}
+
+async def _probe_langraph_agents() -> Dict[str, Any]:
+    """Test langraph agents endpoint (if running)"""
+    try:
+        if time.monotonic() - _last_langraph_probe["ts"] < LANGRAPH_PROBE_TTL_SECONDS:
+            return _last_langraph_probe["status"]
+        
+        response = await http_client.get(LANGRAPH_HEALTH_URL, timeout=5.0)
+        if response.status_code == 200:
+            status = {"langraph_agents_status": "connected"}
+            _last_langraph_probe.update(ts=time.monotonic(), status=status)
+            return status
+        return {"langraph_agents_status": f"error: HTTP {response.status_code}"}
+    except Exception as e:
+        return {"langraph_agents_status": f"error: {str(e)}"}
+
+async def _develop_research_plan(query: str, research_mode: str) -> Dict[str, Any]:
+    """Develop a research plan for the given query"""
+    # Reuse the plan of a similar earlier query when the plan cache has one
+    query_embedding = None
+    if PLAN_CACHE_ENABLED:
         try:
-            research_plan = json.loads(plan_text)
-        except json.JSONDecodeError:
-            # Fallback plan if JSON parsing fails
-            research_plan = {
-                "objective": f"Research and analyze: {query}",
-                "approach": f"Multi-agent {research_mode} research",
-                "agent_tasks": {
-                    "metadata": "Discover relevant data sources and schemas",
-                    "entitlement": "Validate data access permissions",
-                    "data": "Retrieve and process relevant data",
-                    "aggregation": "Synthesize findings into comprehensive response"
-                },
-                "execution_order": ["metadata,entitlement", "data", "aggregation"],
-                "success_criteria": "Complete answer to user query with proper citations"
-            }
+            query_embedding = await _embed_text(query)
+            cached_plan = await db_client.plan_cache_lookup(
+                query_embedding, research_mode, PLAN_CACHE_MIN_SIMILARITY
+            )
+            if cached_plan is not None:
+                logger.info("Research plan served from plan cache")
+                return cached_plan
+        except Exception as e:
+            logger.warning("Plan cache lookup failed: %s", e)
+    
+    user_prompt = PLAN_USER_PROMPT.format(query=query, research_mode=research_mode)
+    
+    try:
+        research_plan = await _chat_completion_json(
+            PLAN_SYSTEM_MESSAGE,
+            user_prompt,
+            PLAN_RESPONSE_FORMAT,
+            max_tokens=800
+        )
+        
+        if query_embedding is not None:
+            try:
+                await db_client.plan_cache_store(query_embedding, research_mode, research_plan)
+            except Exception as e:
+                logger.warning("Plan cache store failed: %s", e)
         
         return research_plan
         
     except Exception as e:
-        logger.error(f"Research plan development error: {str(e)}")
+        logger.error("Research plan development error: %s", e)
         # Return basic fallback plan
         return {
             "objective": f"Research: {query}",
@@ -530,43 +880,111 @@ async def _develop_research_plan(query: str, research_mode: str) -> Dict[str, An
 async def _execute_research_plan(
     session_id: str, 
     research_plan: Dict[str, Any], 
-    query: str
+    query: str,
+    report_progress: Optional[Callable[[float], Awaitable[None]]] = None
 ) -> Dict[str, Any]:
-    """Execute the research plan using langraph agents"""
-    logger.info(f"Executing research plan for session {session_id}")
+    """Execute the research plan using langraph agents
+    
+    The agents service may answer with a single JSON body or stream
+    Server-Sent Events. When streaming, each ``data:`` line is a JSON event.
+    Intermediate events are stored as session memory and reported as progress
+    as they arrive. The event with ``"type": "result"`` carries the final
+    results under ``"result"``. An unreachable service, a broken stream or an
+    unreadable JSON body falls back to _fallback_research_execution.
+    """
+    logger.info("Executing research plan for session %s", session_id)
     
     try:
-        # Call langraph agents endpoint
-        agent_endpoint = os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001")
-        
-        request_payload = {
-            "session_id": session_id,
-            "query": query,
-            "research_plan": research_plan
-        }
+        request_payload = ExecuteResearchRequest(session_id, query, research_plan)
         
-        response = await http_client.post(
-            f"{agent_endpoint}/execute_research",
-            json=request_payload,
-            timeout=300.0  # 5 minute timeout
-        )
+        async with http_client.stream(
+            "POST",
+            LANGRAPH_EXEC_URL,
+            content=_dump_json(request_payload),
+            headers={**JSON_HEADERS, "Accept": "text/event-stream, application/json"}
+        ) as response:
+            if response.status_code != 200:
+                logger.error("Langraph agents error: HTTP %s", response.status_code)
+                return {
+                    "error": f"Agent execution failed with status {response.status_code}",
+                    "agent_results": {},
+                    "total_tokens": 0
+                }
+            
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                body = await response.aread()
+                try:
+                    results = _load_json(body)
+                except ValueError as e:
+                    results = None
+                    logger.error("Unreadable langraph agents response: %s", e)
+                if isinstance(results, dict):
+                    return results
+                return await _fallback_research_execution(session_id, query, research_plan)
+            
+            events_received = 0
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                try:
+                    event = _load_json(line[5:])
+                except ValueError as e:
+                    logger.warning("Skipping malformed agent event for session %s: %s", session_id, e)
+                    continue
+                if isinstance(event, dict) and event.get("type") == "result":
+                    results = event.get("result", {})
+                    if isinstance(results, dict):
+                        return results
+                    logger.error("Langraph agents result is not an object: %s", type(results).__name__)
+                    return {
+                        "error": "Agent execution returned a malformed result",
+                        "agent_results": {},
+                        "total_tokens": 0
+                    }
+                
+                events_received += 1
+                await _record_agent_event(session_id, event, events_received, report_progress)
         
-        if response.status_code == 200:
-            return response.json()
-        else:
-            logger.error(f"Langraph agents error: HTTP {response.status_code}")
-            return {
-                "error": f"Agent execution failed with status {response.status_code}",
-                "agent_results": {},
-                "total_tokens": 0
-            }
+        logger.error("Langraph agents stream ended without a result")
+        return {
+            "error": "Agent execution ended without a result",
+            "agent_results": {},
+            "total_tokens": 0
+        }
             
-    except Exception as e:
-        logger.error(f"Research execution error: {str(e)}")
+    except httpx.HTTPError as e:
+        logger.error("Research execution error: %s", e)
         
-        # Fallback: simple research using available tools
+        # Fallback, only when the agents service can't be reached or the stream
+        # breaks: simple research using available tools
         return await _fallback_research_execution(session_id, query, research_plan)
 
+async def _record_agent_event(
+    session_id: str,
+    event: Any,
+    events_received: int,
+    report_progress: Optional[Callable[[float], Awaitable[None]]]
+):
+    """Store an intermediate agent event and report progress
+    
+    Failures are logged and swallowed, so a database hiccup or a disconnected
+    client never abandons a live agent stream.
+    """
+    try:
+        await db_client.store_session_memory(
+            session_id=session_id,
+            memory_type=MemoryType.INTERMEDIATE_RESULTS,
+            content=event
+        )
+    except Exception as e:
+        logger.warning("Failed to store agent event for session %s: %s", session_id, e)
+    
+    if report_progress is not None:
+        try:
+            await report_progress(events_received)
+        except Exception as e:
+            logger.warning("Failed to report progress for session %s: %s", session_id, e)
+
 async def _fallback_research_execution(
     session_id: str,
     query: str, 
@@ -581,21 +999,20 @@ async def _fallback_research_execution(
     
     try:
         # Try to call demo MCP server for basic research
-        demo_endpoint = os.getenv("DEMO_MCP_ENDPOINT", "http://localhost:8080")
-        
         demo_response = await http_client.post(
-            f"{demo_endpoint}/ask_ai",
-            json={"question": query, "mode": "analyze"},
+            DEMO_ASK_AI_URL,
+            content=_dump_json({"question": query, "mode": "analyze"}),
+            headers=JSON_HEADERS,
             timeout=60.0
         )
         
         if demo_response.status_code == 200:
-            demo_result = demo_response.json()
+            demo_result = _load_json(demo_response.content)
             agent_results["demo_research"] = demo_result
             total_tokens += 500  # Estimate
             
     except Exception as e:
-        logger.warning(f"Demo MCP call failed: {str(e)}")
+        logger.warning("Demo MCP call failed: %s", e)
         agent_results["demo_research"] = {"error": str(e)}
     
     return {
@@ -617,8 +1034,17 @@ async def startup():
         await db_client.connect()
         logger.info("Database connection established")
     except Exception as e:
-        logger.error(f"Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
         # Continue without database for basic functionality
+    
+    # Warm pooled database connections and open the agents service connection
+    # so the first requests don't pay for the setup
+    warmups = [_probe_langraph_agents()]
+    if db_client.pool:
+        warmups.append(db_client.warm_up())
+    for result in await asyncio.gather(*warmups, return_exceptions=True):
+        if isinstance(result, BaseException):
+            logger.warning("Startup warm-up failed: %s", result)
 
 @mcp.hook("shutdown") 
 async def shutdown():
@@ -627,14 +1053,23 @@ async def shutdown():
     try:
         await db_client.disconnect()
         await http_client.aclose()
+        if redis_client is not None:
+            await redis_client.aclose()
         logger.info("Connections closed successfully")
     except Exception as e:
-        logger.error(f"Shutdown error: {e}")
+        logger.error("Shutdown error: %s", e)
 
 if __name__ == "__main__":
+    # Run on uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     # Run the FastMCP server
     port = int(os.getenv("MCP_SERVER_PORT", 8080))
     host = os.getenv("MCP_SERVER_HOST", "0.0.0.0")
     
-    logger.info(f"Starting Multi-Agent Research MCP Server on {host}:{port}")
+    logger.info("Starting Multi-Agent Research MCP Server on %s:%s", host, port)
     mcp.run(host=host, port=port) 
\ No newline at end of file
@@ -35,6 +35,9 @@ import httpx
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Agent server endpoint, resolved once at import
+AGENT_ENDPOINT = os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001")
+
 # HTTP client for calling the agent server
 http_client = httpx.AsyncClient(timeout=300.0)
 
@@ -83,9 +86,6 @@ async def multi_agent_research(
     logger.info(f"Multi-agent research request: {query[:100]}...")
     
     try:
-        # Call the agent server
-        agent_endpoint = os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001")
-        
         request_payload = {
             "query": query,
             "session_id": session_id,
@@ -94,7 +94,7 @@ async def multi_agent_research(
         }
         
         response = await http_client.post(
-            f"{agent_endpoint}/execute_research",
+            f"{AGENT_ENDPOINT}/execute_research",
             json=request_payload,
             timeout=300.0
         )
@@ -132,7 +132,7 @@ async def multi_agent_research(
         return {
             "status": "failed", 
             "error": "Could not connect to agent server",
-            "agent_endpoint": agent_endpoint
+            "agent_endpoint": AGENT_ENDPOINT
         }
     except Exception as e:
         logger.error(f"Research execution failed: {e}")
@@ -178,10 +178,8 @@ async def list_available_agents() -> Dict:
     """
     
     try:
-        agent_endpoint = os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001")
-        
         response = await http_client.get(
-            f"{agent_endpoint}/agents",
+            f"{AGENT_ENDPOINT}/agents",
             timeout=10.0
         )
         
@@ -237,10 +235,8 @@ async def health_check() -> Dict:
     
     # Check agent server
     try:
-        agent_endpoint = os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001") 
-        
         response = await http_client.get(
-            f"{agent_endpoint}/health",
+            f"{AGENT_ENDPOINT}/health",
             timeout=10.0
         )
         
@@ -248,20 +244,20 @@ async def health_check() -> Dict:
             agent_health = response.json()
             health_status["agent_server"] = {
                 "status": agent_health.get("status", "unknown"),
-                "endpoint": agent_endpoint,
+                "endpoint": AGENT_ENDPOINT,
                 "components": agent_health.get("components", {})
             }
         else:
             health_status["agent_server"] = {
                 "status": "error",
-                "endpoint": agent_endpoint,
+                "endpoint": AGENT_ENDPOINT,
                 "error": f"HTTP {response.status_code}"
             }
             
     except Exception as e:
         health_status["agent_server"] = {
             "status": "error",
-            "endpoint": os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001"),
+            "endpoint": AGENT_ENDPOINT,
             "error": str(e)
         }
     
@@ -327,8 +323,7 @@ async def startup():
     
     # Test connection to agent server
     try:
-        agent_endpoint = os.getenv("LANGRAPH_AGENTS_ENDPOINT", "http://localhost:8001")
-        response = await http_client.get(f"{agent_endpoint}/", timeout=5.0)
+        response = await http_client.get(f"{AGENT_ENDPOINT}/", timeout=5.0)
         if response.status_code == 200:
             logger.info("Successfully connected to agent server")
         else:
@@ -346,6 +341,13 @@ async def shutdown():
         logger.error(f"Shutdown error: {e}")
 
 if __name__ == "__main__":
+    # Run on uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     port = int(os.getenv("MCP_SERVER_PORT", 8082))
     host = os.getenv("MCP_SERVER_HOST", "0.0.0.0")
     
@@ -22,8 +22,10 @@ import argparse
 import logging
 from pathlib import Path
 
-# Add the current directory to Python path for imports
-sys.path.insert(0, str(Path(__file__).parent))
+# Add the current directory to Python path for imports (already present when run as a script)
+_SERVER_DIR = str(Path(__file__).parent)
+if _SERVER_DIR not in sys.path:
+    sys.path.insert(0, _SERVER_DIR)
 
 def main():
     """Main entry point for the FastMCP demo server"""
@@ -15,6 +15,7 @@ Environment Variables:
     AZURE_OPENAI_ENDPOINT: The Azure OpenAI endpoint URL
     AZURE_OPENAI_DEPLOYMENT: The Azure OpenAI deployment name to use
     AZURE_OPENAI_API_VERSION: The Azure OpenAI API version to use
+    AZURE_OPENAI_MAX_RETRIES: Retries on rate limits and connection errors (default: 5)
     MCP_SERVER_PORT: Port to run the server on (default: 8080)
     MCP_SERVER_HOST: Host to bind the server to (default: 0.0.0.0)
 """
@@ -62,11 +63,17 @@ for var in required_env_vars:
     if not os.getenv(var):
         raise ValueError(f"{var} environment variable is required")
 
+# Azure OpenAI configuration, resolved once at import
+AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
+AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+
 # Initialize Azure OpenAI client
 openai_client = AsyncAzureOpenAI(
     api_key=os.getenv("AZURE_OPENAI_API_KEY"),
     api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
+    azure_endpoint=AZURE_OPENAI_ENDPOINT,
+    # SDK retries 429s and connection errors with exponential backoff and jitter
+    max_retries=int(os.getenv("AZURE_OPENAI_MAX_RETRIES", "5"))
 )
 
 # Create FastMCP server
@@ -154,7 +161,7 @@ Format the response clearly and professionally.
     
     try:
         response = await openai_client.chat.completions.create(
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+            model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -190,12 +197,12 @@ async def health_check() -> dict:
     # Test Azure OpenAI connection
     try:
         test_response = await openai_client.chat.completions.create(
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+            model=AZURE_OPENAI_DEPLOYMENT,
             messages=[{"role": "user", "content": "Hello"}],
             max_tokens=10
         )
         health_status["azure_openai_status"] = "connected"
-        health_status["azure_openai_model"] = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+        health_status["azure_openai_model"] = AZURE_OPENAI_DEPLOYMENT
     except Exception as e:
         health_status["azure_openai_status"] = f"error: {str(e)}"
         logger.warning(f"Azure OpenAI health check failed: {e}")
@@ -214,8 +221,8 @@ async def get_server_info() -> dict:
         "version": "2.0.0-fastmcp",
         "framework": "FastMCP 2.9+",
         "description": "Tools to use generic AI capabilities with synthetic data generation for demo purposes",
-        "azure_openai_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
-        "azure_openai_deployment": os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+        "azure_openai_endpoint": AZURE_OPENAI_ENDPOINT,
+        "azure_openai_deployment": AZURE_OPENAI_DEPLOYMENT,
         "capabilities": [
             "Synthetic data generation",
             "Data analysis and insights", 
@@ -5,7 +5,7 @@ FastMCP Test Script
 Tests the FastMCP implementation to ensure all functionality works correctly.
 
 Usage:
-    python test_migration.py [--port 8080]
+    python test_migration.py [--port 8080] [--timeout 60]
 """
 
 import asyncio
@@ -19,10 +19,16 @@ import httpx
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Separator banners
+SECTION_RULE = "=" * 50
+SUBSECTION_RULE = "-" * 30
+SUMMARY_RULE = "=" * 60
+
 class MCPTester:
-    def __init__(self, base_url: str, server_name: str):
+    def __init__(self, base_url: str, server_name: str, call_timeout: float = 60.0):
         self.base_url = base_url.rstrip('/')
         self.server_name = server_name
+        self.call_timeout = call_timeout
         self.client = httpx.AsyncClient(timeout=30.0)
     
     async def __aenter__(self):
@@ -93,10 +99,17 @@ class MCPTester:
         """Test calling a specific tool"""
         logger.info(f"Testing {tool_name} call for {self.server_name}")
         
-        response = await self.send_mcp_request("tools/call", {
-            "name": tool_name,
-            "arguments": arguments
-        })
+        # Bound the whole call so a stuck tool can't wedge the suite
+        try:
+            response = await asyncio.wait_for(
+                self.send_mcp_request("tools/call", {
+                    "name": tool_name,
+                    "arguments": arguments
+                }),
+                timeout=self.call_timeout
+            )
+        except asyncio.TimeoutError:
+            response = {"error": f"timed out after {self.call_timeout}s"}
         
         if "error" in response:
             logger.error(f"Tool call {tool_name} failed for {self.server_name}: {response['error']}")
@@ -106,18 +119,18 @@ class MCPTester:
         logger.info(f"✅ Tool call {tool_name} successful for {self.server_name}")
         return result
 
-async def run_fastmcp_tests(port: int):
+async def run_fastmcp_tests(port: int, call_timeout: float = 60.0):
     """Run comprehensive FastMCP tests"""
     logger.info("Starting FastMCP Tests")
-    logger.info("=" * 50)
+    logger.info(SECTION_RULE)
     
     base_url = f"http://localhost:{port}"
     server_name = "FastMCP Server"
     
     logger.info(f"\nTesting {server_name} at {base_url}")
-    logger.info("-" * 30)
+    logger.info(SUBSECTION_RULE)
     
-    async with MCPTester(base_url, server_name) as tester:
+    async with MCPTester(base_url, server_name, call_timeout) as tester:
         # Test 1: Initialization
         init_success = await tester.test_initialize()
         
@@ -132,26 +145,22 @@ async def run_fastmcp_tests(port: int):
             logger.error(f"❌ No tools found")
             return {"status": "failed", "reason": "no tools found"}
         
-        # Test 3: Tool calls
-        tool_results = {}
-        
-        # Test health_check (no arguments)
-        if "health_check" in tool_names:
-            health_result = await tester.test_tool_call("health_check", {})
-            tool_results["health_check"] = health_result
-        
-        # Test get_server_info (no arguments) 
-        if "get_server_info" in tool_names:
-            info_result = await tester.test_tool_call("get_server_info", {})
-            tool_results["get_server_info"] = info_result
-        
-        # Test ask_ai (with arguments)
-        if "ask_ai" in tool_names:
-            ai_result = await tester.test_tool_call("ask_ai", {
+        # Test 3: Tool calls (independent of each other, so issue them concurrently)
+        tool_arguments = {
+            "health_check": {},
+            "get_server_info": {},
+            "ask_ai": {
                 "question": "Generate 3 sample person records",
                 "mode": "generate"
-            })
-            tool_results["ask_ai"] = ai_result
+            }
+        }
+        available_tools = [name for name in tool_arguments if name in tool_names]
+        
+        call_results = await asyncio.gather(*[
+            tester.test_tool_call(name, tool_arguments[name])
+            for name in available_tools
+        ])
+        tool_results = dict(zip(available_tools, call_results))
         
         return {
             "status": "success",
@@ -167,29 +176,44 @@ def main():
         default=8080,
         help="Port for FastMCP server (default: 8080)"
     )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Per tool call timeout in seconds (default: 60)"
+    )
     
     args = parser.parse_args()
     
     logger.info("FastMCP Test Suite")
     logger.info(f"FastMCP server: http://localhost:{args.port}")
     
+    # Run on uvloop's faster event loop when it is installed
     try:
-        result = asyncio.run(run_fastmcp_tests(args.port))
-        
-        # Print summary
-        print("\n" + "=" * 60)
-        print("FASTMCP TEST SUMMARY")
-        print("=" * 60)
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    try:
+        result = asyncio.run(run_fastmcp_tests(args.port, args.timeout))
         
+        # Print summary as a single write
         status = result.get("status", "unknown")
-        print(f"FastMCP Server: {status.upper()}")
+        summary = [
+            "\n" + SUMMARY_RULE,
+            "FASTMCP TEST SUMMARY",
+            SUMMARY_RULE,
+            f"FastMCP Server: {status.upper()}"
+        ]
         if status == "success":
             tools = result.get("tools", [])
-            print(f"  Tools: {len(tools)} available - {tools}")
-            print("  ✅ All tests passed!")
+            summary.append(f"  Tools: {len(tools)} available - {tools}")
+            summary.append("  ✅ All tests passed!")
         else:
             reason = result.get("reason", "unknown")
-            print(f"  ❌ Reason: {reason}")
+            summary.append(f"  ❌ Reason: {reason}")
+        print("\n".join(summary), flush=True)
         
     except KeyboardInterrupt:
         logger.info("Test interrupted by user")
@@ -19,9 +19,10 @@ Environment Variables:
 """
 
 import os
+import time
 import logging
 import httpx
-from typing import Literal
+from typing import Literal, Optional
 from pathlib import Path
 
 # Load environment variables from .env file if available
@@ -61,6 +62,57 @@ if not AI_SDK_USER:
 if not AI_SDK_PASSWORD:
     raise ValueError("DENODO_AI_SDK_PASSWORD is required")
 
+# Shared HTTP client for the Denodo AI SDK so calls reuse pooled keep-alive connections
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared Denodo AI SDK client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            verify=AI_SDK_VERIFY_SSL,
+            auth=(AI_SDK_USER, AI_SDK_PASSWORD),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=60.0
+            )
+        )
+    return _http_client
+
+class CircuitBreaker:
+    """Fail fast on an endpoint after consecutive failures until a cooldown elapses"""
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_count = 0
+        self.opened_at: Optional[float] = None
+    
+    def is_open(self) -> bool:
+        """Check whether calls should be skipped"""
+        if self.opened_at is None:
+            return False
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            # Cooldown elapsed: let the next call through as a trial
+            self.opened_at = None
+            return False
+        return True
+    
+    def record_success(self):
+        """Close the breaker after a successful call"""
+        self.failure_count = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        """Count a failed call and open the breaker once the threshold is reached"""
+        self.failure_count += 1
+        if self.failure_count >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+# Skips AI SDK requests during outages instead of waiting out the full timeout
+ai_sdk_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+
 # Create FastMCP server
 mcp = FastMCP(
     name="denodo",
@@ -109,6 +161,11 @@ async def ask_database(
     
     logger.info(f"Processing database question in '{mode}' mode: {question[:100]}...")
     
+    if ai_sdk_breaker.is_open():
+        error_msg = f"Denodo AI SDK at {AI_SDK_ENDPOINT} is unavailable after repeated failures, retry later"
+        logger.warning(error_msg)
+        return f"Error: {error_msg}"
+    
     # Prepare request parameters for Denodo AI SDK
     params = {
         "question": question,
@@ -118,33 +175,37 @@ async def ask_database(
     }
 
     try:
-        async with httpx.AsyncClient(verify=AI_SDK_VERIFY_SSL, timeout=120.0) as client:
-            response = await client.post(
-                f"{AI_SDK_ENDPOINT}/answerQuestion", 
-                json=params, 
-                auth=(AI_SDK_USER, AI_SDK_PASSWORD)
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract appropriate result based on mode
-            if mode == "data":
-                result = data.get('execution_result', 'The Denodo AI SDK did not return a result.')
-            else:  # metadata mode
-                result = data.get('answer', 'The Denodo AI SDK did not return a result.')
-            
-            logger.info("Successfully processed database query")
-            return result
+        response = await get_http_client().post(
+            f"{AI_SDK_ENDPOINT}/answerQuestion", 
+            json=params, 
+            timeout=120.0
+        )
+        response.raise_for_status()
+        data = response.json()
+        
+        # Extract appropriate result based on mode
+        if mode == "data":
+            result = data.get('execution_result', 'The Denodo AI SDK did not return a result.')
+        else:  # metadata mode
+            result = data.get('answer', 'The Denodo AI SDK did not return a result.')
+        
+        ai_sdk_breaker.record_success()
+        logger.info("Successfully processed database query")
+        return result
             
     except httpx.TimeoutException:
+        ai_sdk_breaker.record_failure()
         error_msg = "Request timed out while connecting to the Denodo AI SDK"
         logger.error(error_msg)
         return f"Error: {error_msg}"
     except httpx.ConnectError:
+        ai_sdk_breaker.record_failure()
         error_msg = f"Could not connect to Denodo AI SDK at {AI_SDK_ENDPOINT}"
         logger.error(error_msg)
         return f"Error: {error_msg}"
     except httpx.HTTPStatusError as e:
+        if e.response.status_code >= 500:
+            ai_sdk_breaker.record_failure()
         error_msg = f"HTTP error {e.response.status_code}: {e.response.text}"
         logger.error(error_msg)
         return f"Error: {error_msg}"
@@ -172,17 +233,16 @@ async def health_check() -> dict:
     }
     
     try:
-        async with httpx.AsyncClient(verify=AI_SDK_VERIFY_SSL, timeout=30.0) as client:
-            response = await client.get(
-                f"{AI_SDK_ENDPOINT}/health",
-                auth=(AI_SDK_USER, AI_SDK_PASSWORD)
-            )
-            
-            if response.status_code == 200:
-                health_status["denodo_status"] = "connected"
-                health_status["denodo_response_time_ms"] = response.elapsed.total_seconds() * 1000
-            else:
-                health_status["denodo_status"] = f"http_error_{response.status_code}"
+        response = await get_http_client().get(
+            f"{AI_SDK_ENDPOINT}/health",
+            timeout=30.0
+        )
+        
+        if response.status_code == 200:
+            health_status["denodo_status"] = "connected"
+            health_status["denodo_response_time_ms"] = response.elapsed.total_seconds() * 1000
+        else:
+            health_status["denodo_status"] = f"http_error_{response.status_code}"
                 
     except httpx.ConnectError:
         health_status["denodo_status"] = "connection_failed"
@@ -238,6 +298,15 @@ async def get_server_info() -> dict:
         }
     }
 
+@mcp.hook("shutdown")
+async def shutdown():
+    """Close the shared Denodo AI SDK client on server shutdown"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Denodo AI SDK client closed")
+
 if __name__ == "__main__":
     # Get server configuration from environment
     host = os.getenv("MCP_SERVER_HOST", "0.0.0.0")